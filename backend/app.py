@@ -1,9 +1,65 @@
+import functools
+import logging
+import mimetypes
 import os
-from flask import Flask, jsonify
+import orjson
+from flask import Flask, jsonify, g, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from flask_compress import Compress
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from config import config
+from services.session_store import create_session_store
+from services.storage_service import StorageService
+from services.tts_service import TTSService
+from routes.recording import recording_bp
+from routes.projects import projects_bp
+from routes.folders import folders_bp
+from routes.steps import steps_bp
+
+
+logger = logging.getLogger(__name__)
+
+
+# Precomputed MIME types for the closed set of extensions we actually serve;
+# avoids running the mimetypes machinery on every static hit
+_MIME_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+}
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson's C-level serializer.
+
+    Serializes 3-10x faster than the stdlib json encoder, which is the
+    dominant CPU cost on list endpoints like GET /api/folders.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Static directories only need to be ensured once per process, not on every
+# create_app call (management scripts build the app too)
+_DIRS_READY = False
+
+
+@functools.lru_cache(maxsize=128)
+def _guess_mimetype(extension):
+    """Resolve a MIME type for an extension not in _MIME_TYPES."""
+    mimetype, _ = mimetypes.guess_type(f'file{extension}')
+    return mimetype
 
 
 def create_app(config_name=None):
@@ -21,39 +77,108 @@ def create_app(config_name=None):
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = OrjsonProvider(app)
     
     # Initialize CORS
     CORS(app, origins=app.config['CORS_ORIGINS'])
+
+    # Compress JSON responses (static files are already-encoded binaries)
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+
+    # Offload static file bodies to the reverse proxy when configured;
+    # send_from_directory then emits an X-Sendfile header instead of streaming
+    app.use_x_sendfile = app.config['USE_X_SENDFILE']
+
+    # Recording session store (Redis-backed when REDIS_URL is configured)
+    app.extensions['session_store'] = create_session_store(app.config['REDIS_URL'])
+
+    # Shared service singletons; both are stateless beyond their config, so
+    # constructing them per request only burns allocations
+    storage_service = StorageService(
+        images_folder=app.config['IMAGES_FOLDER'],
+        audio_folder=app.config['AUDIO_FOLDER'],
+        thumbnails_folder=app.config['THUMBNAILS_FOLDER']
+    )
+    app.extensions['storage_service'] = storage_service
+    app.extensions['tts_service'] = TTSService(
+        storage_service=storage_service,
+        fps=app.config['VIDEO_FPS']
+    )
     
     # Create static directories if they don't exist
-    os.makedirs(app.config['IMAGES_FOLDER'], exist_ok=True)
-    os.makedirs(app.config['AUDIO_FOLDER'], exist_ok=True)
-    os.makedirs(app.config['THUMBNAILS_FOLDER'], exist_ok=True)
+    global _DIRS_READY
+    if not _DIRS_READY:
+        os.makedirs(app.config['IMAGES_FOLDER'], exist_ok=True)
+        os.makedirs(app.config['AUDIO_FOLDER'], exist_ok=True)
+        os.makedirs(app.config['THUMBNAILS_FOLDER'], exist_ok=True)
+        _DIRS_READY = True
     
     # Initialize database engine
-    engine = create_engine(
-        app.config['SQLALCHEMY_DATABASE_URI'],
-        echo=app.config['SQLALCHEMY_ECHO'],
-        pool_pre_ping=True,
-        pool_recycle=3600
-    )
-    
-    # Create scoped session
-    session_factory = sessionmaker(bind=engine)
-    db_session = scoped_session(session_factory)
+    db_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    engine_options = {
+        'echo': app.config['SQLALCHEMY_ECHO'],
+        # Explicit compiled-statement cache size (default is 500): the API
+        # re-issues the same handful of statement shapes on every request,
+        # so cache hits skip SQL compilation entirely
+        'query_cache_size': 1200,
+    }
+
+    if db_uri.startswith('sqlite'):
+        # Pool sizing is moot for SQLite; share a single connection across threads
+        engine_options['poolclass'] = StaticPool
+        engine_options['connect_args'] = {'check_same_thread': False}
+    else:
+        # Size the pool for concurrent request throughput (configurable via env)
+        engine_options['pool_size'] = app.config['DB_POOL_SIZE']
+        engine_options['max_overflow'] = app.config['DB_MAX_OVERFLOW']
+        engine_options['pool_recycle'] = app.config['DB_POOL_RECYCLE']
+        engine_options['pool_timeout'] = app.config['DB_POOL_TIMEOUT']
+        engine_options['pool_pre_ping'] = app.config['DB_POOL_PRE_PING']
+
+    engine = create_engine(db_uri, **engine_options)
+
+    if db_uri.startswith('sqlite'):
+        # WAL lets readers proceed alongside a writer and synchronous=NORMAL
+        # halves fsyncs while staying durable on clean shutdown
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA mmap_size=268435456')
+            cursor.close()
     
-    # Store db_session in app context
-    app.db_session = db_session
+    # Session factory: short-lived sessions opened per request via g.db.
+    # expire_on_commit=False avoids attribute reloads after commit;
+    # autoflush=False skips redundant flushes on read-only paths.
+    app.SessionLocal = sessionmaker(
+        bind=engine,
+        expire_on_commit=False,
+        autoflush=False
+    )
     app.db_engine = engine
+
+    # Long-lived session for scripts and tests (request handlers use g.db)
+    app.db_session = app.SessionLocal()
+
+    @app.before_request
+    def open_db_session():
+        g.db = app.SessionLocal()
+
+    @app.teardown_request
+    def close_db_session(exception=None):
+        db = g.pop('db', None)
+        if db is not None:
+            db.close()
     
     # Register error handlers
     register_error_handlers(app)
     
     # Register blueprints
-    from routes.recording import recording_bp
-    from routes.projects import projects_bp
-    from routes.folders import folders_bp
-    from routes.steps import steps_bp
     app.register_blueprint(recording_bp, url_prefix='/api/recording')
     app.register_blueprint(projects_bp, url_prefix='/api/projects')
     app.register_blueprint(folders_bp, url_prefix='/api/folders')
@@ -68,36 +193,26 @@ def create_app(config_name=None):
     @app.route('/static/<path:folder>/<path:filename>')
     def serve_static(folder, filename):
         """Serve static files (images, audio, thumbnails)."""
-        from flask import send_from_directory
-        import mimetypes
-        
         # Map folder to directory
         folder_map = {
             'images': app.config['IMAGES_FOLDER'],
             'audio': app.config['AUDIO_FOLDER'],
             'thumbnails': app.config['THUMBNAILS_FOLDER']
         }
-        
+
         if folder not in folder_map:
             return jsonify({'error': 'Not Found', 'message': 'Invalid folder'}), 404
-        
+
         directory = folder_map[folder]
-        
-        # Set correct MIME type
-        mimetype, _ = mimetypes.guess_type(filename)
+
+        # Set correct MIME type (O(1) dict hit for known extensions)
+        extension = os.path.splitext(filename)[1].lower()
+        mimetype = _MIME_TYPES.get(extension)
         if mimetype is None:
-            if filename.endswith('.png'):
-                mimetype = 'image/png'
-            elif filename.endswith('.mp3'):
-                mimetype = 'audio/mpeg'
-        
+            mimetype = _guess_mimetype(extension)
+
         return send_from_directory(directory, filename, mimetype=mimetype)
     
-    # Teardown database session
-    @app.teardown_appcontext
-    def shutdown_session(exception=None):
-        db_session.remove()
-    
     return app
 
 
@@ -125,6 +240,19 @@ def register_error_handlers(app):
             'message': 'An unexpected error occurred'
         }), 500
     
+    @app.errorhandler(SQLAlchemyError)
+    def database_error(error):
+        # App-level handler so views don't each need a try/except wrapper;
+        # rolls back the request session before responding
+        logger.error(f"Database error: {str(error)}")
+        db = g.get('db')
+        if db is not None:
+            db.rollback()
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'Database error occurred'
+        }), 500
+
     @app.errorhandler(503)
     def service_unavailable(error):
         return jsonify({
@@ -9,13 +9,15 @@ from models.folder import Folder, FolderType
 app = create_app()
 
 with app.app_context():
-    folders = app.db_session.query(Folder).all()
-    print(f"Total folders: {len(folders)}")
-    for f in folders:
-        print(f"ID: {f.id}, Name: '{f.name}', Type: {f.type}")
-        
-    trash = app.db_session.query(Folder).filter_by(name='Trash', type=FolderType.SYSTEM).first()
-    if trash:
-        print(f"\n✅ Trash folder found: ID {trash.id}")
+    # Column-only query: no ORM hydration, one round trip answers everything
+    rows = app.db_session.query(Folder.id, Folder.name, Folder.type).all()
+    print(f"Total folders: {len(rows)}")
+    for r in rows:
+        print(f"ID: {r.id}, Name: '{r.name}', Type: {r.type}")
+
+    folder_ids = {(r.name, r.type): r.id for r in rows}
+    trash_id = folder_ids.get(('Trash', FolderType.SYSTEM.value))
+    if trash_id is not None:
+        print(f"\n✅ Trash folder found: ID {trash_id}")
     else:
         print("\n❌ Trash folder NOT found matching criteria (name='Trash', type=FolderType.SYSTEM)")
@@ -1,20 +1,24 @@
 #!/usr/bin/env python3
 """检查数据库中的项目和步骤"""
 
+from collections import defaultdict
+from sqlalchemy import func
+
 from app import create_app
 from models.project import Project
 from models.step import Step
 
 app = create_app()
 with app.app_context():
-    # 获取所有项目
-    all_projects = Project.query.all()
-    total_count = len(all_projects)
-    
+    db_session = app.db_session
+
+    # 获取项目总数
+    total_count = db_session.query(func.count(Project.id)).scalar()
+
     print(f'\n=== 数据库检查 ===')
     print(f'总项目数: {total_count}')
     print('')
-    
+
     if total_count == 0:
         print('❌ 数据库中没有任何项目！')
         print('')
@@ -29,31 +33,52 @@ with app.app_context():
         print('2. 复制 diagnose-recording.js 的内容')
         print('3. 粘贴到控制台并按回车')
     else:
-        # 获取最近的项目
-        projects = Project.query.order_by(Project.created_at.desc()).limit(10).all()
+        # 获取最近的项目（流式读取，内存占用与项目数无关）
+        projects = list(
+            db_session.query(Project)
+            .order_by(Project.created_at.desc())
+            .limit(10)
+            .yield_per(100)
+        )
+        project_ids = [p.id for p in projects]
+
+        # 一次分组查询获取步骤数，避免每个项目一条 COUNT 查询
+        step_counts = dict(
+            db_session.query(Step.project_id, func.count(Step.id))
+            .filter(Step.project_id.in_(project_ids))
+            .group_by(Step.project_id)
+            .all()
+        )
+
+        # 一次批量查询加载所有步骤详情
+        steps_by_project = defaultdict(list)
+        for s in db_session.query(Step).filter(
+            Step.project_id.in_(project_ids)
+        ).order_by(Step.project_id, Step.order_index):
+            steps_by_project[s.project_id].append(s)
+
         print(f'最近的 {len(projects)} 个项目:')
         print('')
-        
+
         for p in projects:
-            step_count = Step.query.filter_by(project_id=p.id).count()
+            step_count = step_counts.get(p.id, 0)
             print(f'项目 {p.id}: {p.title}')
             print(f'  - UUID: {p.uuid}')
             print(f'  - 创建时间: {p.created_at}')
             print(f'  - 步骤数: {step_count}')
             print(f'  - 缩略图: {p.thumbnail_url or "(无)"}')
-            
+
             # 显示步骤详情
             if step_count > 0:
-                steps = Step.query.filter_by(project_id=p.id).order_by(Step.order_index).all()
                 print(f'  - 步骤详情:')
-                for s in steps:
+                for s in steps_by_project[p.id]:
                     target = s.target_text[:30] if s.target_text else "(无文本)"
-                    print(f'    {s.order_index}. {s.action_type.value} - {target}')
+                    print(f'    {s.order_index}. {s.action_type} - {target}')
                     print(f'       图片: {s.image_url}')
                     print(f'       音频: {s.audio_url or "(无)"}')
             else:
                 print(f'  ⚠️  此项目没有步骤！')
-            
+
             print('')
-    
+
     print('=== 检查完成 ===')
@@ -29,6 +29,18 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = DEBUG
+
+    # Connection pool configuration (ignored for SQLite)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 20))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    # Fail fast instead of queueing requests for 30s when the pool is
+    # exhausted; the DB server's max_connections must cover
+    # (pool_size + max_overflow) x worker count
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 5))
+    # pool_pre_ping issues a SELECT 1 on every checkout; disable it when
+    # pool_recycle already covers the server-side idle timeout
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
     
     # Storage configuration
     STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
@@ -38,6 +50,15 @@ class Config:
     
     # File upload configuration
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB max file size
+
+    # Upper bound on a decoded screenshot; checked before Base64 decode so an
+    # oversized payload is rejected without paying for the decode allocation
+    MAX_SCREENSHOT_BYTES = int(os.getenv('MAX_SCREENSHOT_BYTES', 5 * 1024 * 1024))
+
+    # Let the reverse proxy serve static bytes via X-Sendfile/X-Accel-Redirect.
+    # Requires an nginx "internal" location (or Apache XSendFile) mapped to
+    # the static folders; leave off when running the dev server standalone.
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'False').lower() == 'true'
     
     # TTS configuration
     TTS_LANGUAGE = os.getenv('TTS_LANGUAGE', 'en')
@@ -46,6 +67,10 @@ class Config:
     # CORS configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
 
+    # Recording session storage; set a Redis URL to share sessions across
+    # workers (falls back to an in-process dict when unset)
+    REDIS_URL = os.getenv('REDIS_URL')
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
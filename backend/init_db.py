@@ -70,32 +70,30 @@ def init_database():
             if existing_folders:
                 print("✓ System folders already exist:")
                 for folder in existing_folders:
-                    print(f"  - {folder.name} (id={folder.id}, type={folder.type.value})")
+                    print(f"  - {folder.name} (id={folder.id}, type={folder.type})")
                 return True
             
             # Create system folders
             print("Creating system folders...")
             all_flows = Folder(name='All Flows', type=FolderType.SYSTEM)
             trash = Folder(name='Trash', type=FolderType.SYSTEM)
-            
-            app.db_session.add(all_flows)
-            app.db_session.add(trash)
-            
+
+            app.db_session.add_all([all_flows, trash])
+
             try:
                 app.db_session.commit()
                 print("✓ System folders created successfully:")
-                print(f"  - {all_flows.name} (id={all_flows.id}, type={all_flows.type.value})")
-                print(f"  - {trash.name} (id={trash.id}, type={trash.type.value})")
+                print(f"  - {all_flows.name} (id={all_flows.id}, type={all_flows.type})")
+                print(f"  - {trash.name} (id={trash.id}, type={trash.type})")
             except SQLAlchemyError as e:
                 app.db_session.rollback()
                 print(f"✗ Failed to create system folders: {e}")
                 return False
             
-            # Verify system folders were created
-            verify_folders = app.db_session.query(Folder).filter(
-                Folder.type == FolderType.SYSTEM
-            ).all()
-            
+            # Verify system folders were created (ids assigned at commit means
+            # the insert succeeded; no need to re-query)
+            verify_folders = [f for f in (all_flows, trash) if f.id is not None]
+
             if len(verify_folders) != 2:
                 print(f"✗ Warning: Expected 2 system folders, found {len(verify_folders)}")
                 return False
@@ -1,15 +1,25 @@
 """
 Folder model for organizing projects.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Enum
-from sqlalchemy.orm import relationship
+from functools import cached_property
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from models.base import Base
 import enum
 
 
-class FolderType(enum.Enum):
-    """Enum for folder types."""
+# Serialization keys shared by every to_dict call; zipping against a cached
+# tuple avoids rebuilding the key set per instance on list endpoints
+_FOLDER_KEYS = ('id', 'name', 'type', 'createdAt')
+
+
+class FolderType(str, enum.Enum):
+    """Enum for folder types.
+
+    Subclasses str so members compare equal to the plain strings stored
+    in the VARCHAR column.
+    """
     SYSTEM = 'system'
     USER = 'user'
 
@@ -29,20 +39,31 @@ class Folder(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
-    type = Column(Enum(FolderType), nullable=False, default=FolderType.USER)
+    # Stored as VARCHAR to skip per-row enum marshaling; validated in Python
+    type = Column(String(16), nullable=False, default=FolderType.USER.value, index=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
     projects = relationship('Project', back_populates='folder', lazy='dynamic')
     
+    @validates('type')
+    def _validate_type(self, key, value):
+        """Coerce to a plain string and reject unknown folder types."""
+        return FolderType(value).value
+
     def __repr__(self):
-        return f"<Folder(id={self.id}, name='{self.name}', type='{self.type.value}')>"
+        return f"<Folder(id={self.id}, name='{self.name}', type='{self.type}')>"
     
+    @cached_property
+    def created_at_iso(self):
+        """ISO-formatted creation timestamp, computed once per instance."""
+        return self.created_at.isoformat() if self.created_at else None
+
     def to_dict(self):
         """Convert folder to dictionary representation."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'type': self.type.value,
-            'createdAt': self.created_at.isoformat() if self.created_at else None
-        }
+        return dict(zip(_FOLDER_KEYS, (
+            self.id,
+            self.name,
+            self.type,
+            self.created_at_iso
+        )))
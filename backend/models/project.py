@@ -1,13 +1,21 @@
 """
 Project model representing a demo video project.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from functools import cached_property
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from models.base import Base
 import uuid
 
 
+# Serialization keys shared by every to_dict call; zipping against a cached
+# tuple avoids rebuilding the key set per instance on list endpoints
+_PROJECT_KEYS = (
+    'id', 'uuid', 'title', 'folderId', 'thumbnailUrl', 'createdAt', 'deletedAt'
+)
+
+
 class Project(Base):
     """
     Project model representing a demo video project.
@@ -24,7 +32,13 @@ class Project(Base):
         steps: Relationship to project steps
     """
     __tablename__ = 'projects'
-    
+    __table_args__ = (
+        # Project listings always filter by folder with deleted_at IS NULL
+        # and walk created_at backwards for keyset pagination; MySQL/SQLite
+        # lack partial indexes so use a plain composite
+        Index('ix_projects_folder_live', 'folder_id', 'deleted_at', 'created_at'),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     uuid = Column(String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
@@ -35,11 +49,21 @@ class Project(Base):
     
     # Relationships
     folder = relationship('Folder', back_populates='projects')
-    steps = relationship('Step', back_populates='project', lazy='dynamic', cascade='all, delete-orphan')
+    steps = relationship(
+        'Step',
+        back_populates='project',
+        order_by='Step.order_index',
+        cascade='all, delete-orphan'
+    )
     
     def __repr__(self):
         return f"<Project(id={self.id}, uuid='{self.uuid}', title='{self.title}')>"
     
+    @cached_property
+    def created_at_iso(self):
+        """ISO-formatted creation timestamp, computed once per instance."""
+        return self.created_at.isoformat() if self.created_at else None
+
     def to_dict(self, include_steps=False):
         """
         Convert project to dictionary representation.
@@ -50,17 +74,19 @@ class Project(Base):
         Returns:
             Dictionary representation of the project
         """
-        result = {
-            'id': self.id,
-            'uuid': self.uuid,
-            'title': self.title,
-            'folderId': self.folder_id,
-            'thumbnailUrl': self.thumbnail_url,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'deletedAt': self.deleted_at.isoformat() if self.deleted_at else None
-        }
+        result = dict(zip(_PROJECT_KEYS, (
+            self.id,
+            self.uuid,
+            self.title,
+            self.folder_id,
+            self.thumbnail_url,
+            self.created_at_iso,
+            self.deleted_at.isoformat() if self.deleted_at else None
+        )))
         
         if include_steps:
-            result['steps'] = [step.to_dict() for step in self.steps.order_by('order_index')]
+            # Relationship is ordered by order_index; reuses the collection
+            # when it was eager-loaded instead of issuing a fresh query
+            result['steps'] = [step.to_dict() for step in self.steps]
         
         return result
@@ -1,14 +1,26 @@
 """
 Step model representing a single captured user interaction.
 """
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from models.base import Base
 import enum
 
 
-class ActionType(enum.Enum):
-    """Enum for action types."""
+# Serialization keys shared by every to_dict call; zipping against a cached
+# tuple avoids rebuilding the key set per instance on list endpoints
+_STEP_KEYS = (
+    'id', 'projectId', 'orderIndex', 'actionType', 'targetText',
+    'scriptText', 'audioUrl', 'imageUrl', 'posX', 'posY', 'durationFrames'
+)
+
+
+class ActionType(str, enum.Enum):
+    """Enum for action types.
+
+    Subclasses str so members compare equal to the plain strings stored
+    in the VARCHAR column.
+    """
     CLICK = 'click'
     SCROLL = 'scroll'
 
@@ -32,11 +44,17 @@ class Step(Base):
         project: Relationship to parent project
     """
     __tablename__ = 'steps'
-    
+    __table_args__ = (
+        # Covers the filter-by-project + order-by-index access path used by
+        # project serialization, avoiding a post-filter sort
+        Index('ix_steps_project_order', 'project_id', 'order_index'),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
     order_index = Column(Integer, nullable=False)
-    action_type = Column(Enum(ActionType), nullable=False)
+    # Stored as VARCHAR to skip per-row enum marshaling; validated in Python
+    action_type = Column(String(16), nullable=False)
     target_text = Column(Text, nullable=True)
     script_text = Column(Text, nullable=False)
     audio_url = Column(String(512), nullable=True)
@@ -48,21 +66,26 @@ class Step(Base):
     # Relationships
     project = relationship('Project', back_populates='steps')
     
+    @validates('action_type')
+    def _validate_action_type(self, key, value):
+        """Coerce to a plain string and reject unknown action types."""
+        return ActionType(value).value
+
     def __repr__(self):
         return f"<Step(id={self.id}, project_id={self.project_id}, order_index={self.order_index})>"
     
     def to_dict(self):
         """Convert step to dictionary representation."""
-        return {
-            'id': self.id,
-            'projectId': self.project_id,
-            'orderIndex': self.order_index,
-            'actionType': self.action_type.value,
-            'targetText': self.target_text,
-            'scriptText': self.script_text,
-            'audioUrl': self.audio_url,
-            'imageUrl': self.image_url,
-            'posX': self.pos_x,
-            'posY': self.pos_y,
-            'durationFrames': self.duration_frames
-        }
+        return dict(zip(_STEP_KEYS, (
+            self.id,
+            self.project_id,
+            self.order_index,
+            self.action_type,
+            self.target_text,
+            self.script_text,
+            self.audio_url,
+            self.image_url,
+            self.pos_x,
+            self.pos_y,
+            self.duration_frames
+        )))
@@ -10,12 +10,17 @@ This module provides endpoints for:
 """
 
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
+from sqlalchemy import func, update
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime, timezone
+from sqlalchemy.orm import raiseload, selectinload
+from datetime import datetime
 
 from models.project import Project
 from models.folder import Folder, FolderType
+from models.step import Step
+from utils.db import exists_id
+from utils.system_folders import get_system_folder_id
 
 
 logger = logging.getLogger(__name__)
@@ -73,34 +78,28 @@ def create_project():
                 'message': 'Title cannot exceed 255 characters'
             }), 400
         
-        db_session = current_app.db_session
+        db_session = g.db
         
         # Get folder_id (use default if not provided)
         folder_id = data.get('folderId')
         
         if folder_id is None:
-            # Get default folder (All Flows)
-            default_folder = db_session.query(Folder).filter_by(
-                name='All Flows',
-                type=FolderType.SYSTEM
-            ).first()
-            
-            if not default_folder:
+            # Get default folder (All Flows); the ID is cached per app
+            folder_id = get_system_folder_id(db_session, 'All Flows')
+
+            if folder_id is None:
                 return jsonify({
                     'error': 'Internal Server Error',
                     'message': 'Default folder not found'
                 }), 500
-            
-            folder_id = default_folder.id
         else:
-            # Validate folder exists
-            folder = db_session.query(Folder).filter_by(id=folder_id).first()
-            if not folder:
+            # Validate folder exists (probe avoids hydrating the row)
+            if not exists_id(db_session, Folder, folder_id):
                 return jsonify({
                     'error': 'Bad Request',
                     'message': f'Folder with id {folder_id} not found'
                 }), 400
-        
+
         # Create project
         project = Project(
             title=title.strip(),
@@ -115,7 +114,7 @@ def create_project():
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in create_project: {str(e)}")
-        current_app.db_session.rollback()
+        g.db.rollback()
         return jsonify({
             'error': 'Internal Server Error',
             'message': 'Database error occurred'
@@ -136,10 +135,14 @@ def get_projects():
     
     Query parameters:
         folderId: Optional folder ID to filter projects
-    
+        limit: Optional page size (default 50, capped at 200)
+        cursor: Optional ISO-8601 created_at cursor from a previous page's
+            nextCursor; returns projects created strictly before it
+
     Returns:
-        JSON response with list of projects
-    
+        JSON response with list of projects and a nextCursor token (null
+        when there are no further pages)
+
     Example response:
         {
             "projects": [
@@ -148,7 +151,7 @@ def get_projects():
                     "uuid": "project-uuid",
                     "title": "New Demo - 2024/01/15",
                     "folderId": 1,
-                    "thumbnailUrl": "/static/thumbnails/uuid.png",
+                    "thumbnailUrl": "/static/thumbnails/uuid.webp",
                     "createdAt": "2024-01-15T10:30:00Z",
                     "stepCount": 12
                 }
@@ -156,26 +159,32 @@ def get_projects():
         }
     """
     try:
-        db_session = current_app.db_session
+        db_session = g.db
         
         # Get folder_id filter from query params
         folder_id = request.args.get('folderId', type=int)
-        
-        # Build query
-        query = db_session.query(Project).filter(Project.deleted_at.is_(None))
+
+        # Keyset pagination params; a created_at cursor keeps page N as
+        # cheap as page 1 (no OFFSET scan) and bounds response size
+        limit = min(max(request.args.get('limit', default=50, type=int), 1), 200)
+        cursor = request.args.get('cursor')
+
+        # Build query with the step count aggregated in the same SELECT,
+        # avoiding one COUNT round trip per returned project
+        query = (
+            db_session.query(Project, func.count(Step.id))
+            .outerjoin(Step, Step.project_id == Project.id)
+            .filter(Project.deleted_at.is_(None))
+            .group_by(Project.id)
+        )
         
         if folder_id is not None:
-            # Check if this is the "All Flows" folder
-            folder = db_session.query(Folder).filter_by(id=folder_id).first()
-            if folder and folder.name == 'All Flows' and folder.type == FolderType.SYSTEM:
+            # Check if this is the "All Flows" folder (cached system folder ID)
+            if folder_id == get_system_folder_id(db_session, 'All Flows'):
                 # For All Flows, exclude Trash folder projects but include all others
-                trash_folder = db_session.query(Folder).filter_by(
-                    name='Trash',
-                    type=FolderType.SYSTEM
-                ).first()
-                
-                if trash_folder:
-                    query = query.filter(Project.folder_id != trash_folder.id)
+                trash_id = get_system_folder_id(db_session, 'Trash')
+                if trash_id is not None:
+                    query = query.filter(Project.folder_id != trash_id)
                 # Don't filter by folder_id for All Flows - show all non-trash projects
             else:
                 # Filter by specific folder
@@ -183,25 +192,41 @@ def get_projects():
         else:
             # No folder specified (default "All Projects" view)
             # Exclude projects in Trash folder
-            trash_folder = db_session.query(Folder).filter_by(
-                name='Trash',
-                type=FolderType.SYSTEM
-            ).first()
-            
-            if trash_folder:
-                query = query.filter(Project.folder_id != trash_folder.id)
-        
-        # Order by created_at descending (newest first)
-        projects = query.order_by(Project.created_at.desc()).all()
-        
+            trash_id = get_system_folder_id(db_session, 'Trash')
+            if trash_id is not None:
+                query = query.filter(Project.folder_id != trash_id)
+        
+        if cursor is not None:
+            try:
+                cursor_dt = datetime.fromisoformat(cursor)
+            except ValueError:
+                return jsonify({
+                    'error': 'Bad Request',
+                    'message': 'Invalid cursor'
+                }), 400
+            query = query.filter(Project.created_at < cursor_dt)
+
+        # Order by created_at descending (newest first); fetch one extra
+        # row to detect whether another page exists
+        rows = (
+            query.order_by(Project.created_at.desc(), Project.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0].created_at.isoformat()
+
         # Convert to dict and add step count
         projects_data = []
-        for project in projects:
+        for project, step_count in rows:
             project_dict = project.to_dict()
-            project_dict['stepCount'] = project.steps.count()
+            project_dict['stepCount'] = step_count
             projects_data.append(project_dict)
-        
-        return jsonify({'projects': projects_data}), 200
+
+        return jsonify({'projects': projects_data, 'nextCursor': next_cursor}), 200
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in get_projects: {str(e)}")
@@ -232,12 +257,12 @@ def get_project(project_id):
             "uuid": "project-uuid",
             "title": "New Demo - 2024/01/15",
             "folderId": 1,
-            "thumbnailUrl": "/static/thumbnails/uuid.png",
+            "thumbnailUrl": "/static/thumbnails/uuid.webp",
             "createdAt": "2024-01-15T10:30:00Z"
         }
     """
     try:
-        db_session = current_app.db_session
+        db_session = g.db
         
         # Get project
         project = db_session.query(Project).filter_by(id=project_id).first()
@@ -297,15 +322,22 @@ def get_project_details(project_identifier):
         }
     """
     try:
-        db_session = current_app.db_session
-        
-        # Try to parse as integer ID first, otherwise treat as UUID
-        try:
-            project_id = int(project_identifier)
-            project = db_session.query(Project).filter_by(id=project_id).first()
-        except ValueError:
-            # Not an integer, treat as UUID
-            project = db_session.query(Project).filter_by(uuid=project_identifier).first()
+        db_session = g.db
+        
+        # Eager-load steps in one batched SELECT alongside the project;
+        # raiseload makes any accidental lazy traversal fail loudly instead
+        # of silently issuing extra queries
+        query = db_session.query(Project).options(
+            selectinload(Project.steps).raiseload('*'),
+            raiseload('*')
+        )
+
+        # Numeric identifiers are IDs, anything else is a UUID; isdigit()
+        # avoids raising (and unwinding) a ValueError on every UUID lookup
+        if project_identifier.isdigit():
+            project = query.filter_by(id=int(project_identifier)).first()
+        else:
+            project = query.filter_by(uuid=project_identifier).first()
         
         if not project:
             return jsonify({
@@ -315,10 +347,12 @@ def get_project_details(project_identifier):
         
         # Get project dict with steps
         project_dict = project.to_dict(include_steps=True)
-        
-        # Calculate total duration
-        total_duration = sum(step['durationFrames'] for step in project_dict['steps'])
-        project_dict['totalDurationFrames'] = total_duration
+
+        # Total duration from the already-loaded step rows; no second pass
+        # over the serialized dicts and no extra aggregate round trip
+        project_dict['totalDurationFrames'] = sum(
+            step.duration_frames for step in project.steps
+        )
         
         return jsonify(project_dict), 200
     
@@ -357,7 +391,7 @@ def update_project(project_id):
             "uuid": "project-uuid",
             "title": "Updated Demo Title",
             "folderId": 2,
-            "thumbnailUrl": "/static/thumbnails/uuid.png",
+            "thumbnailUrl": "/static/thumbnails/uuid.webp",
             "createdAt": "2024-01-15T10:30:00Z"
         }
     """
@@ -371,7 +405,7 @@ def update_project(project_id):
                 'message': 'Request body is required'
             }), 400
         
-        db_session = current_app.db_session
+        db_session = g.db
         
         # Get project
         project = db_session.query(Project).filter_by(id=project_id).first()
@@ -403,10 +437,9 @@ def update_project(project_id):
         # Update folder_id if provided
         if 'folderId' in data:
             folder_id = data['folderId']
-            
-            # Validate folder exists
-            folder = db_session.query(Folder).filter_by(id=folder_id).first()
-            if not folder:
+
+            # Validate folder exists (probe avoids hydrating the row)
+            if not exists_id(db_session, Folder, folder_id):
                 return jsonify({
                     'error': 'Bad Request',
                     'message': f'Folder with id {folder_id} not found'
@@ -422,7 +455,7 @@ def update_project(project_id):
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in update_project: {str(e)}")
-        current_app.db_session.rollback()
+        g.db.rollback()
         return jsonify({
             'error': 'Internal Server Error',
             'message': 'Database error occurred'
@@ -451,31 +484,35 @@ def delete_project(project_id):
         }
     """
     try:
-        db_session = current_app.db_session
-        
-        # Get project
-        project = db_session.query(Project).filter_by(id=project_id).first()
-        
-        if not project:
+        db_session = g.db
+
+        # Soft delete with a single UPDATE; no need to hydrate the row just
+        # to stamp one column, and rowcount doubles as the existence check.
+        # func.now() keeps the timestamp on the DB clock, matching the
+        # created_at server default and immune to worker clock skew
+        rowcount = db_session.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+        ).rowcount
+        db_session.commit()
+
+        if rowcount == 0:
             return jsonify({
                 'error': 'Not Found',
                 'message': 'Project not found'
             }), 404
-        
-        # Soft delete by setting deleted_at
-        project.deleted_at = datetime.now(timezone.utc)
-        db_session.commit()
-        
-        logger.info(f"Soft deleted project {project.id}")
-        
+
+        logger.info(f"Soft deleted project {project_id}")
+
         return jsonify({
             'message': 'Project deleted successfully',
-            'projectId': project.id
+            'projectId': project_id
         }), 200
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in delete_project: {str(e)}")
-        current_app.db_session.rollback()
+        g.db.rollback()
         return jsonify({
             'error': 'Internal Server Error',
             'message': 'Database error occurred'
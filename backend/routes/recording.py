@@ -7,16 +7,20 @@ This module provides endpoints for:
 - Stopping and finalizing a recording session
 """
 
+import os
+import threading
+import time
 import uuid
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Blueprint, request, jsonify, current_app, g
 from sqlalchemy.exc import SQLAlchemyError
 
 from models.project import Project
 from models.step import Step, ActionType
 from models.folder import Folder, FolderType
-from services.storage_service import StorageService
-from services.tts_service import TTSService
+from utils.system_folders import get_system_folder_id
 
 
 logger = logging.getLogger(__name__)
@@ -24,8 +28,102 @@ logger = logging.getLogger(__name__)
 recording_bp = Blueprint('recording', __name__)
 
 
-# In-memory session storage (for simplicity, could be Redis in production)
-active_sessions = {}
+# Shared pool for offloading image decode/write and TTS network calls so the
+# two can overlap instead of serializing inside the request handler
+_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+# Outstanding background audio patches per session. TTS stays off the chunk
+# upload critical path, but finalization joins these so a project's audio
+# fields are settled before the recording flow reports it done. Per-process
+# like _EXECUTOR itself: the worker that accepted an upload owns its patch.
+_PENDING_AUDIO = {}
+_PENDING_AUDIO_LOCK = threading.Lock()
+
+# Upper bound on how long finalization waits for stragglers; a patch that
+# misses it still lands in the background, just after the response
+_AUDIO_JOIN_TIMEOUT_SECONDS = 30
+
+
+def _track_audio_future(session_id, future):
+    """Register a background audio patch for later joining."""
+    with _PENDING_AUDIO_LOCK:
+        pending = _PENDING_AUDIO.setdefault(session_id, [])
+        # Prune settled futures so long sessions don't accumulate them
+        pending[:] = [f for f in pending if not f.done()]
+        pending.append(future)
+
+
+def _join_audio_futures(session_id):
+    """Wait for the session's outstanding audio patches to land."""
+    with _PENDING_AUDIO_LOCK:
+        pending = _PENDING_AUDIO.pop(session_id, None)
+    if not pending:
+        return
+    _, not_done = wait(pending, timeout=_AUDIO_JOIN_TIMEOUT_SECONDS)
+    if not_done:
+        logger.warning(
+            f"{len(not_done)} audio patches for session {session_id} "
+            "still pending after join timeout"
+        )
+
+
+def _session_store():
+    """Return the app's session store (Redis-backed or in-memory)."""
+    return current_app.extensions['session_store']
+
+
+def _bad_request(message):
+    """Build the standard 400 payload used by every validation branch."""
+    return jsonify({
+        'error': 'Bad Request',
+        'message': message
+    }), 400
+
+
+# Fallback step duration when no audio exists (3 seconds at 30fps)
+_DEFAULT_DURATION_FRAMES = 90
+
+# How long a completed session's cached payload stays in the store so late
+# retry polls still get the real response before the session is dropped
+_COMPLETED_SESSION_TTL_SECONDS = 60
+
+
+# Built once at import: set-difference against data.keys() replaces the
+# per-request list comprehension, and the dict lookup replaces the linear
+# member scan inside ActionType(value)
+_REQUIRED_CHUNK_FIELDS = frozenset(('sessionId', 'orderIndex', 'actionType', 'posX', 'posY'))
+_REQUIRED_CHUNK_FIELDS_B64 = _REQUIRED_CHUNK_FIELDS | {'screenshotBase64'}
+_REQUIRED_BATCH_STEP_FIELDS = _REQUIRED_CHUNK_FIELDS_B64 - {'sessionId'}
+_ACTION_TYPES = {action.value: action for action in ActionType}
+
+
+def _apply_step_audio(app, step_id, audio_future):
+    """
+    Patch a step's audio fields once its background TTS call finishes.
+
+    Runs on the shared pool after the /chunk response has gone out; opens
+    a short-lived session of its own since the request session is closed.
+    """
+    audio_result = audio_future.result()
+    if not audio_result:
+        logger.warning(f"TTS generation failed for step {step_id}, keeping default duration")
+        return
+
+    audio_url, duration_frames = audio_result
+    db_session = app.SessionLocal()
+    try:
+        db_session.execute(
+            Step.__table__.update()
+            .where(Step.__table__.c.id == step_id)
+            .values(audio_url=audio_url, duration_frames=duration_frames)
+        )
+        db_session.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to store audio for step {step_id}: {str(e)}")
+        db_session.rollback()
+    finally:
+        db_session.close()
 
 
 @recording_bp.route('/start', methods=['POST'])
@@ -47,12 +145,12 @@ def start_recording():
         session_id = str(uuid.uuid4())
         
         # Create session data
-        active_sessions[session_id] = {
+        _session_store().set(session_id, {
             'session_id': session_id,
             'project_id': None,
             'step_count': 0,
             'first_image_url': None
-        }
+        })
         
         logger.info(f"Started recording session: {session_id}")
         
@@ -73,7 +171,12 @@ def start_recording():
 def upload_chunk():
     """
     Upload a step chunk during recording.
-    
+
+    Accepts either a JSON body with a Base64 screenshot (legacy clients)
+    or multipart/form-data with the PNG as a raw 'screenshot' file part
+    and the remaining fields as form values — the multipart path skips
+    the ~33% Base64 inflation and the decode entirely.
+
     Expected request body:
         {
             "sessionId": "uuid-v4",
@@ -98,26 +201,41 @@ def upload_chunk():
         }
     """
     try:
-        # Parse request data
-        data = request.get_json()
-        
-        # Log received data for debugging (without the large base64 image)
-        debug_data = {k: v if k != 'screenshotBase64' else f'<base64 data {len(v) if v else 0} chars>' 
-                      for k, v in (data or {}).items()}
-        logger.info(f"Received chunk upload request: {debug_data}")
-        
-        # Validate request has JSON data
+        # Parse request data: multipart carries the PNG as a file part with
+        # metadata as form fields; JSON bodies decode lazily (silent=True:
+        # malformed JSON yields None and the 400 below, not an exception)
+        if (request.content_type or '').startswith('multipart/'):
+            data = request.form
+            screenshot_file = request.files.get('screenshot')
+        else:
+            data = request.get_json(silent=True)
+            screenshot_file = None
+
+        # Validate request has data
         if not data:
-            logger.error("No JSON data in request body")
-            return jsonify({
-                'error': 'Bad Request',
-                'message': 'Request body must contain JSON data'
-            }), 400
-        
-        # Validate required fields
-        required_fields = ['sessionId', 'orderIndex', 'actionType', 'posX', 'posY', 'screenshotBase64']
-        missing_fields = [field for field in required_fields if field not in data]
-        
+            logger.error("No form or JSON data in request body")
+            return _bad_request('Request body must contain JSON or form data')
+
+        # Per-chunk logging is diagnostic, not operational: DEBUG level so
+        # production INFO skips even the len() scan, with lazy %-formatting
+        # so no string work happens when the level is off
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Received chunk upload: session=%s order=%s action=%s screenshot=%d chars",
+                data.get('sessionId'),
+                data.get('orderIndex'),
+                data.get('actionType'),
+                len(data.get('screenshotBase64') or '')
+            )
+
+        # Validate required fields (the screenshot arrives as a file part
+        # on the multipart path, as a Base64 field otherwise)
+        if screenshot_file is None:
+            required_fields = _REQUIRED_CHUNK_FIELDS_B64
+        else:
+            required_fields = _REQUIRED_CHUNK_FIELDS
+        missing_fields = sorted(required_fields - data.keys())
+
         if missing_fields:
             logger.error(f"Missing required fields: {missing_fields}. Received fields: {list(data.keys())}")
             return jsonify({
@@ -125,116 +243,148 @@ def upload_chunk():
                 'message': f'Missing required fields: {", ".join(missing_fields)}',
                 'receivedFields': list(data.keys())
             }), 400
-        
+
+        # Bound the screenshot before any decode work; Base64 inflates the
+        # payload by ~4/3, so the string length approximates decoded size
+        # (multipart parts are capped by MAX_CONTENT_LENGTH at the socket)
+        if screenshot_file is None:
+            max_screenshot_bytes = current_app.config['MAX_SCREENSHOT_BYTES']
+            if len(data['screenshotBase64']) * 3 // 4 > max_screenshot_bytes:
+                return jsonify({
+                    'error': 'Payload Too Large',
+                    'message': 'Screenshot exceeds maximum allowed size'
+                }), 413
+
         session_id = data['sessionId']
         
         # Validate session exists
-        if session_id not in active_sessions:
-            return jsonify({
-                'error': 'Bad Request',
-                'message': 'Invalid session ID'
-            }), 400
-        
-        session = active_sessions[session_id]
-        
-        # Initialize services
-        storage_service = StorageService(
-            images_folder=current_app.config['IMAGES_FOLDER'],
-            audio_folder=current_app.config['AUDIO_FOLDER'],
-            thumbnails_folder=current_app.config['THUMBNAILS_FOLDER']
-        )
-        tts_service = TTSService(
-            storage_service=storage_service,
-            fps=current_app.config['VIDEO_FPS']
-        )
-        
-        # Decode and save Base64 image
+        store = _session_store()
+        session = store.get(session_id)
+        if session is None:
+            return _bad_request('Invalid session ID')
+
+        # Validate everything that can 400 before any side-effecting work,
+        # so a bad field never leaks an orphaned image or wastes a TTS call
+        try:
+            action_type = _ACTION_TYPES[data['actionType']].value
+            order_index = int(data['orderIndex'])
+            pos_x = int(data['posX'])
+            pos_y = int(data['posY'])
+        except (KeyError, ValueError, TypeError):
+            return _bad_request('Invalid field value: actionType must be a known '
+                                'action and orderIndex/posX/posY must be integers')
+
+        # Shared service singletons built once in create_app
+        storage_service = current_app.extensions['storage_service']
+        tts_service = current_app.extensions['tts_service']
+        
+        # Kick off the image write and the TTS generation concurrently;
+        # the two are independent
+        if screenshot_file is not None:
+            image_future = _EXECUTOR.submit(
+                storage_service.save_image_stream, screenshot_file
+            )
+        else:
+            image_future = _EXECUTOR.submit(
+                storage_service.save_image, data['screenshotBase64']
+            )
+
+        # Generate script text from target text
+        target_text = data.get('targetText', '')
+        if target_text:
+            script_text = f"Click on {target_text}"
+        else:
+            script_text = f"Perform {data['actionType']} action"
+
+        audio_future = _EXECUTOR.submit(tts_service.generate_audio, script_text)
+
         try:
-            image_url = storage_service.save_image(data['screenshotBase64'])
+            image_url = image_future.result()
         except ValueError as e:
-            return jsonify({
-                'error': 'Bad Request',
-                'message': f'Invalid Base64 image data: {str(e)}'
-            }), 400
-        
+            audio_future.cancel()
+            return _bad_request(f'Invalid Base64 image data: {str(e)}')
+
         # Store first image URL for thumbnail generation
+        session_dirty = False
         if session['first_image_url'] is None:
             session['first_image_url'] = image_url
-        
+            session_dirty = True
+
         # Create project if this is the first step
         if session['project_id'] is None:
-            # Get default folder (All Flows)
-            db_session = current_app.db_session
-            default_folder = db_session.query(Folder).filter_by(
-                name='All Flows',
-                type=FolderType.SYSTEM
-            ).first()
-            
-            if not default_folder:
-                # Create default folder if it doesn't exist
+            # Get default folder (All Flows); the ID is cached per app
+            db_session = g.db
+            default_folder_id = get_system_folder_id(db_session, 'All Flows')
+
+            if default_folder_id is None:
+                # Create default folder if it doesn't exist; flush (not
+                # commit) assigns its ID so the project below can reference
+                # it and both INSERTs land in a single transaction
                 default_folder = Folder(name='All Flows', type=FolderType.SYSTEM)
                 db_session.add(default_folder)
-                db_session.commit()
-            
-            # Create project
-            from datetime import datetime
+                db_session.flush()
+                default_folder_id = default_folder.id
+
+            # Create project in the same transaction as any folder creation
             project_title = f"New Demo - {datetime.now().strftime('%Y/%m/%d %H:%M')}"
             project = Project(
                 title=project_title,
-                folder_id=default_folder.id
+                folder_id=default_folder_id
             )
             db_session.add(project)
             db_session.commit()
             
             session['project_id'] = project.id
+            session_dirty = True
             logger.info(f"Created project {project.id} for session {session_id}")
         
-        # Generate script text from target text
-        target_text = data.get('targetText', '')
-        if target_text:
-            script_text = f"Click on {target_text}"
-        else:
-            script_text = f"Perform {data['actionType']} action"
-        
-        # Generate TTS audio
-        audio_result = tts_service.generate_audio(script_text)
-        if audio_result:
-            audio_url, duration_frames = audio_result
-        else:
-            audio_url = None
-            duration_frames = 90  # Default 3 seconds
-            logger.warning(f"TTS generation failed for step, using default duration")
-        
-        # Create Step record
-        db_session = current_app.db_session
-        step = Step(
-            project_id=session['project_id'],
-            order_index=data['orderIndex'],
-            action_type=ActionType(data['actionType']),
-            target_text=target_text,
-            script_text=script_text,
-            audio_url=audio_url,
-            image_url=image_url,
-            pos_x=data['posX'],
-            pos_y=data['posY'],
-            duration_frames=duration_frames
-        )
-        db_session.add(step)
+        # Insert the step via Core: the response only needs the new ID, so
+        # skip ORM instrumentation and identity-map bookkeeping entirely.
+        # The TTS call is NOT joined here — the row starts with the default
+        # duration and a background task patches in the audio, keeping the
+        # external TTS latency off the recording critical path
+        db_session = g.db
+        result = db_session.execute(Step.__table__.insert(), {
+            'project_id': session['project_id'],
+            'order_index': order_index,
+            'action_type': action_type,
+            'target_text': target_text,
+            'script_text': script_text,
+            'audio_url': None,
+            'image_url': image_url,
+            'pos_x': pos_x,
+            'pos_y': pos_y,
+            'duration_frames': _DEFAULT_DURATION_FRAMES
+        })
         db_session.commit()
-        
-        session['step_count'] += 1
-        
-        logger.info(f"Saved step {step.id} for session {session_id}")
-        
+        step_id = result.inserted_primary_key[0]
+
+        _track_audio_future(session_id, _EXECUTOR.submit(
+            _apply_step_audio,
+            current_app._get_current_object(),
+            step_id,
+            audio_future
+        ))
+
+        # Persist session fields only when the first chunk changed them;
+        # the counter bump is atomic on its own (HINCRBY on Redis), so the
+        # steady-state chunk costs a single store operation and concurrent
+        # uploads can't lose increments
+        if session_dirty:
+            store.set(session_id, session)
+        store.increment(session_id, 'step_count')
+
+        logger.info(f"Saved step {step_id} for session {session_id}")
+
         return jsonify({
-            'stepId': step.id,
+            'stepId': step_id,
             'imageUrl': image_url,
             'status': 'saved'
         }), 200
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in upload_chunk: {str(e)}")
-        current_app.db_session.rollback()
+        g.db.rollback()
         return jsonify({
             'error': 'Internal Server Error',
             'message': 'Database error occurred'
@@ -248,6 +398,215 @@ def upload_chunk():
         }), 500
 
 
+def _apply_batch_audio(app, step_items):
+    """
+    Patch audio fields for a batch of steps once their TTS calls finish.
+
+    Runs on the shared pool after the /chunks response has gone out; the
+    gTTS round trips overlap via generate_audio_batch and all updates
+    land in one short-lived session.
+    """
+    tts_service = app.extensions['tts_service']
+    results = tts_service.generate_audio_batch(
+        [(script_text, 'en') for _, script_text in step_items]
+    )
+
+    db_session = app.SessionLocal()
+    try:
+        for (step_id, _), audio_result in zip(step_items, results):
+            if not audio_result:
+                logger.warning(f"TTS generation failed for step {step_id}, keeping default duration")
+                continue
+            audio_url, duration_frames = audio_result
+            db_session.execute(
+                Step.__table__.update()
+                .where(Step.__table__.c.id == step_id)
+                .values(audio_url=audio_url, duration_frames=duration_frames)
+            )
+        db_session.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to store batch audio: {str(e)}")
+        db_session.rollback()
+    finally:
+        db_session.close()
+
+
+@recording_bp.route('/chunks', methods=['POST'])
+def upload_chunks():
+    """
+    Upload several step chunks in a single request.
+
+    Amortizes the WSGI round trip, session-store writes and the commit
+    across a whole batch: images decode on the shared pool, all step rows
+    land in one transaction, and TTS runs as one background batch.
+    /chunk remains for clients that upload as they capture.
+
+    Expected request body:
+        {
+            "sessionId": "uuid-v4",
+            "steps": [
+                {
+                    "orderIndex": 1,
+                    "actionType": "click",
+                    "targetText": "Submit Button",
+                    "posX": 450,
+                    "posY": 320,
+                    "screenshotBase64": "data:image/png;base64,iVBORw0KG..."
+                },
+                ...
+            ]
+        }
+
+    Returns:
+        JSON response with stepIds (in input order), imageUrls, and status
+    """
+    try:
+        data = request.get_json(silent=True)
+
+        if not data or 'sessionId' not in data:
+            return _bad_request('Missing required field: sessionId')
+
+        steps = data.get('steps')
+        if not isinstance(steps, list) or not steps:
+            return _bad_request('steps must be a non-empty list')
+
+        session_id = data['sessionId']
+        store = _session_store()
+        session = store.get(session_id)
+        if session is None:
+            return _bad_request('Invalid session ID')
+
+        # Validate the whole batch before any side-effecting work
+        max_screenshot_bytes = current_app.config['MAX_SCREENSHOT_BYTES']
+        validated = []
+        for index, step in enumerate(steps):
+            missing_fields = sorted(_REQUIRED_BATCH_STEP_FIELDS - step.keys())
+            if missing_fields:
+                return _bad_request(
+                    f'Step {index}: missing required fields: {", ".join(missing_fields)}'
+                )
+            if len(step['screenshotBase64']) * 3 // 4 > max_screenshot_bytes:
+                return jsonify({
+                    'error': 'Payload Too Large',
+                    'message': f'Step {index}: screenshot exceeds maximum allowed size'
+                }), 413
+            try:
+                validated.append({
+                    'action_type': _ACTION_TYPES[step['actionType']].value,
+                    'order_index': int(step['orderIndex']),
+                    'pos_x': int(step['posX']),
+                    'pos_y': int(step['posY'])
+                })
+            except (KeyError, ValueError, TypeError):
+                return _bad_request(
+                    f'Step {index}: invalid field value: actionType must be a '
+                    'known action and orderIndex/posX/posY must be integers'
+                )
+
+        storage_service = current_app.extensions['storage_service']
+
+        # Decode and write all screenshots concurrently on the shared pool
+        image_futures = [
+            _EXECUTOR.submit(storage_service.save_image, step['screenshotBase64'])
+            for step in steps
+        ]
+        try:
+            image_urls = [future.result() for future in image_futures]
+        except ValueError as e:
+            return _bad_request(f'Invalid Base64 image data: {str(e)}')
+
+        session_dirty = False
+        if session['first_image_url'] is None:
+            session['first_image_url'] = image_urls[0]
+            session_dirty = True
+
+        db_session = g.db
+
+        # Create project if this is the first upload for the session
+        if session['project_id'] is None:
+            default_folder_id = get_system_folder_id(db_session, 'All Flows')
+
+            if default_folder_id is None:
+                default_folder = Folder(name='All Flows', type=FolderType.SYSTEM)
+                db_session.add(default_folder)
+                db_session.flush()
+                default_folder_id = default_folder.id
+
+            project_title = f"New Demo - {datetime.now().strftime('%Y/%m/%d %H:%M')}"
+            project = Project(
+                title=project_title,
+                folder_id=default_folder_id
+            )
+            db_session.add(project)
+            db_session.flush()
+
+            session['project_id'] = project.id
+            session_dirty = True
+            logger.info(f"Created project {project.id} for session {session_id}")
+
+        # Insert every step row in one transaction with a single commit;
+        # TTS is not joined here — rows start at the default duration and
+        # one background batch patches the audio in afterwards
+        step_items = []
+        step_ids = []
+        for step, fields, image_url in zip(steps, validated, image_urls):
+            target_text = step.get('targetText', '')
+            if target_text:
+                script_text = f"Click on {target_text}"
+            else:
+                script_text = f"Perform {step['actionType']} action"
+
+            result = db_session.execute(Step.__table__.insert(), {
+                'project_id': session['project_id'],
+                'order_index': fields['order_index'],
+                'action_type': fields['action_type'],
+                'target_text': target_text,
+                'script_text': script_text,
+                'audio_url': None,
+                'image_url': image_url,
+                'pos_x': fields['pos_x'],
+                'pos_y': fields['pos_y'],
+                'duration_frames': _DEFAULT_DURATION_FRAMES
+            })
+            step_id = result.inserted_primary_key[0]
+            step_ids.append(step_id)
+            step_items.append((step_id, script_text))
+        db_session.commit()
+
+        _track_audio_future(session_id, _EXECUTOR.submit(
+            _apply_batch_audio,
+            current_app._get_current_object(),
+            step_items
+        ))
+
+        if session_dirty:
+            store.set(session_id, session)
+        store.increment(session_id, 'step_count', len(steps))
+
+        logger.info(f"Saved {len(step_ids)} steps for session {session_id}")
+
+        return jsonify({
+            'stepIds': step_ids,
+            'imageUrls': image_urls,
+            'status': 'saved'
+        }), 200
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database error in upload_chunks: {str(e)}")
+        g.db.rollback()
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'Database error occurred'
+        }), 500
+
+    except Exception as e:
+        logger.error(f"Failed to upload chunks: {str(e)}")
+        return jsonify({
+            'error': 'Internal Server Error',
+            'message': 'Failed to upload chunks'
+        }), 500
+
+
 @recording_bp.route('/stop', methods=['POST'])
 def stop_recording():
     """
@@ -273,51 +632,48 @@ def stop_recording():
     try:
         # Parse request data
         data = request.get_json()
-        print(f"DEBUG: stop_recording called with data: {data}", flush=True)
-        
+        logger.debug("stop_recording called with data: %s", data)
+
         # Validate required fields
         if 'sessionId' not in data:
-            print("DEBUG: Missing sessionId", flush=True)
-            return jsonify({
-                'error': 'Bad Request',
-                'message': 'Missing required field: sessionId'
-            }), 400
-        
+            return _bad_request('Missing required field: sessionId')
+
         session_id = data['sessionId']
-        
+
         # Validate session exists
-        if session_id not in active_sessions:
-            print(f"DEBUG: Invalid session ID: {session_id}", flush=True)
-            return jsonify({
-                'error': 'Bad Request',
-                'message': 'Invalid session ID'
-            }), 400
-        
-        session = active_sessions[session_id]
+        store = _session_store()
+        session = store.get(session_id)
+        if session is None:
+            return _bad_request('Invalid session ID')
+
         project_id = session['project_id']
-        print(f"DEBUG: Session found. project_id: {project_id}", flush=True)
-        
+
+        # Kick off the thumbnail (PNG decode + resize) on the pool so it
+        # overlaps with the DB work below instead of adding to it
+        thumbnail_future = None
+        if session.get('first_image_url'):
+            storage_service = current_app.extensions['storage_service']
+            thumbnail_future = _EXECUTOR.submit(
+                storage_service.generate_thumbnail, session['first_image_url']
+            )
+
         # If no project was created (no steps recorded), create an empty project
         if project_id is None:
-            # Get default folder (All Flows)
-            db_session = current_app.db_session
-            default_folder = db_session.query(Folder).filter_by(
-                name='All Flows',
-                type=FolderType.SYSTEM
-            ).first()
-            
-            if not default_folder:
+            # Get default folder (All Flows); the ID is cached per app
+            db_session = g.db
+            default_folder_id = get_system_folder_id(db_session, 'All Flows')
+
+            if default_folder_id is None:
                 return jsonify({
                     'error': 'Internal Server Error',
                     'message': 'Default folder not found'
                 }), 500
-            
+
             # Create empty project
-            from datetime import datetime
             project_title = f"New Demo - {datetime.now().strftime('%Y/%m/%d %H:%M')}"
             project = Project(
                 title=project_title,
-                folder_id=default_folder.id
+                folder_id=default_folder_id
             )
             db_session.add(project)
             db_session.commit()
@@ -327,7 +683,7 @@ def stop_recording():
             logger.info(f"Created empty project {project_id} for session {session_id}")
         else:
             # Get existing project from database
-            db_session = current_app.db_session
+            db_session = g.db
             project = db_session.query(Project).filter_by(id=project_id).first()
             
             if not project:
@@ -335,12 +691,27 @@ def stop_recording():
                     'error': 'Not Found',
                     'message': 'Project not found'
                 }), 404
-        
-        # Mark session as uploading (wait for finish signal)
-        from datetime import datetime
+
+        # Join the thumbnail future and persist it together with any other
+        # project changes in a single commit
+        if thumbnail_future is not None and not project.thumbnail_url:
+            try:
+                project.thumbnail_url = thumbnail_future.result()
+                db_session.commit()
+            except ValueError as e:
+                logger.warning(f"Thumbnail generation failed for project {project.id}: {str(e)}")
+
+        # Join the session's outstanding audio patches so readers of the
+        # project immediately after /stop see the final audio fields; this
+        # is a one-time wait per session, not on the hot chunk path
+        _join_audio_futures(session_id)
+
+        # Mark session as uploading (wait for finish signal); epoch float so
+        # the value survives the JSON round trip in the Redis backend
         session['status'] = 'uploading'
         session['project_uuid'] = project.uuid
-        session['stop_time'] = datetime.now()
+        session['stop_time'] = time.time()
+        store.set(session_id, session)
         
         # Build redirect URL
         redirect_url = f"http://localhost:3000/editor/{project.uuid}"
@@ -356,7 +727,7 @@ def stop_recording():
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in stop_recording: {str(e)}")
-        current_app.db_session.rollback()
+        g.db.rollback()
         return jsonify({
             'error': 'Internal Server Error',
             'message': 'Database error occurred'
@@ -382,14 +753,15 @@ def finish_recording():
             return jsonify({'error': 'Bad Request'}), 400
             
         session_id = data['sessionId']
-        if session_id not in active_sessions:
+        store = _session_store()
+        session = store.get(session_id)
+        if session is None:
             return jsonify({'error': 'Invalid session'}), 400
-            
-        session = active_sessions[session_id]
         
         # Only transition to processing if currently uploading
         if session.get('status') == 'uploading':
             session['status'] = 'processing'
+            store.set(session_id, session)
             logger.info(f"Session {session_id} finished uploading, marked as processing")
             
         return jsonify({'status': 'processing'}), 200
@@ -406,7 +778,9 @@ def get_recording_status(session_id):
     """
     try:
         # Check if session exists
-        if session_id not in active_sessions:
+        store = _session_store()
+        session = store.get(session_id)
+        if session is None:
             # Session not found, assume it's completed
             logger.info(f"Status check for unknown/completed session {session_id}")
             response = jsonify({
@@ -415,14 +789,18 @@ def get_recording_status(session_id):
             })
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             return response, 200
-        
-        session = active_sessions[session_id]
-        
+
+        # Already finalized: answer from the cached payload so repeated
+        # polls (or late retries) never touch the database again
+        if session.get('status') == 'completed':
+            response = jsonify(session['final_response'])
+            response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+            return response, 200
+
         # Check for timeout in uploading state
         # If stuck in uploading for > 15 seconds, force transition to processing
         # Also force processing if stop_time is missing (legacy session from before restart)
         if session.get('status') == 'uploading':
-            from datetime import datetime, timedelta
             stop_time = session.get('stop_time')
             
             should_force_processing = False
@@ -431,13 +809,14 @@ def get_recording_status(session_id):
                 # Legacy session or error - force completion
                 logger.warning(f"Session {session_id} stuck in uploading with no stop_time. Forcing processing.")
                 should_force_processing = True
-            elif (datetime.now() - stop_time) > timedelta(seconds=15):
+            elif (time.time() - stop_time) > 15:
                 # Timeout
                 logger.warning(f"Session {session_id} stuck in uploading for > 15s. Forcing processing.")
                 should_force_processing = True
             
             if should_force_processing:
                 session['status'] = 'processing'
+                store.set(session_id, session)
                 # Fall through to processing handler below
             else:
                  response = jsonify({
@@ -452,15 +831,15 @@ def get_recording_status(session_id):
         # If session is marked processing (finish called or timeout forced), finalize it
         if session.get('status') == 'processing':
             try:
-                db_session = current_app.db_session
+                # Backstop for chunks uploaded after /stop: settle any audio
+                # patches still in flight before reporting completion
+                _join_audio_futures(session_id)
+
+                db_session = g.db
                 project = db_session.query(Project).filter_by(id=session['project_id']).first()
                 
                 if project and not project.thumbnail_url and session.get('first_image_url'):
-                    storage_service = StorageService(
-                        images_folder=current_app.config['IMAGES_FOLDER'],
-                        audio_folder=current_app.config['AUDIO_FOLDER'],
-                        thumbnails_folder=current_app.config['THUMBNAILS_FOLDER']
-                    )
+                    storage_service = current_app.extensions['storage_service']
                     thumbnail_url = storage_service.generate_thumbnail(session['first_image_url'])
                     project.thumbnail_url = thumbnail_url
                     db_session.commit()
@@ -468,23 +847,29 @@ def get_recording_status(session_id):
                 elif project and not project.thumbnail_url:
                     logger.warning(f"No first image URL for project {project.id}, skipping thumbnail")
                 
-                # Mark as completed and clean up
-                del active_sessions[session_id]
-                
-                response = jsonify({
+                # Mark as completed and cache the final payload under a short
+                # grace TTL: polls within the window short-circuit above
+                # without a DB query, then the session is dropped for good
+                # (both backends expire it) instead of lingering in the store
+                payload = {
                     'status': 'completed',
                     'projectId': project.id,
                     'uuid': project.uuid,
                     'stepCount': session['step_count']
-                })
+                }
+                store.set(session_id, {
+                    'status': 'completed',
+                    'final_response': payload
+                }, ttl=_COMPLETED_SESSION_TTL_SECONDS)
+
+                response = jsonify(payload)
                 response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
                 return response, 200
                 
             except Exception as e:
                 logger.error(f"Error processing session {session_id}: {str(e)}")
                 # Mark as completed anyway to avoid infinite loop
-                if session_id in active_sessions:
-                    del active_sessions[session_id]
+                store.delete(session_id)
                 
                 response = jsonify({
                     'status': 'completed',
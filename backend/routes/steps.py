@@ -6,7 +6,7 @@ This module provides endpoints for:
 """
 
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from sqlalchemy.exc import SQLAlchemyError
 
 from models.step import Step
@@ -65,7 +65,7 @@ def update_script(step_id):
                 'message': 'Script text cannot be empty'
             }), 400
         
-        db_session = current_app.db_session
+        db_session = g.db
         
         # Get step
         step = db_session.query(Step).filter_by(id=step_id).first()
@@ -118,7 +118,7 @@ def update_script(step_id):
     
     except SQLAlchemyError as e:
         logger.error(f"Database error in update_script: {str(e)}")
-        current_app.db_session.rollback()
+        g.db.rollback()
         return jsonify({
             'error': 'Internal Server Error',
             'message': 'Database error occurred'
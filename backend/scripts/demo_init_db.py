@@ -47,7 +47,7 @@ def demo_init_database():
         for folder in folders:
             print(f"  • {folder.name}")
             print(f"    - ID: {folder.id}")
-            print(f"    - Type: {folder.type.value}")
+            print(f"    - Type: {folder.type}")
             print(f"    - Created: {folder.created_at}")
         
         print()
@@ -0,0 +1,157 @@
+"""
+Session store for active recording sessions.
+
+This service provides functionality for:
+- Storing in-flight recording session state
+- Sharing sessions across workers via Redis when configured
+- Falling back to an in-process dict for single-worker development
+
+Session values are plain dicts of JSON-serializable data; timestamps are
+stored as epoch floats so both backends behave identically.
+"""
+
+import json
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+# Default TTL: abandoned sessions are dropped after an hour. Both backends
+# honor it — Redis via EXPIRE, the in-memory store via its own deadlines.
+SESSION_TTL_SECONDS = 3600
+
+
+class InMemorySessionStore:
+    """Dict-backed store; only valid with a single worker process.
+
+    Mirrors the Redis backend's TTL behavior: every set refreshes the
+    session's deadline, and expired entries are dropped lazily on access
+    plus in a periodic sweep, so finished or abandoned recordings cannot
+    accumulate in process memory.
+    """
+
+    _SWEEP_INTERVAL_SECONDS = 60
+
+    def __init__(self):
+        self._sessions = {}
+        self._deadlines = {}
+        self._next_sweep = time.monotonic() + self._SWEEP_INTERVAL_SECONDS
+
+    def _sweep_expired(self):
+        """Evict every expired session, at most once per sweep interval."""
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self._SWEEP_INTERVAL_SECONDS
+        expired = [
+            session_id for session_id, deadline in self._deadlines.items()
+            if deadline <= now
+        ]
+        for session_id in expired:
+            self.delete(session_id)
+
+    def _live(self, session_id):
+        """Return the session dict if present and unexpired, else None."""
+        deadline = self._deadlines.get(session_id)
+        if deadline is not None and deadline <= time.monotonic():
+            self.delete(session_id)
+            return None
+        return self._sessions.get(session_id)
+
+    def get(self, session_id):
+        """Return the session dict, or None if unknown or expired."""
+        self._sweep_expired()
+        return self._live(session_id)
+
+    def set(self, session_id, data, ttl=SESSION_TTL_SECONDS):
+        """Store (or replace) the session dict and refresh its TTL."""
+        self._sweep_expired()
+        self._sessions[session_id] = data
+        self._deadlines[session_id] = time.monotonic() + ttl
+
+    def increment(self, session_id, field, amount=1):
+        """Add ``amount`` to a numeric session field and return the result."""
+        if self._live(session_id) is None:
+            raise KeyError(session_id)
+        session = self._sessions[session_id]
+        session[field] = session.get(field, 0) + amount
+        return session[field]
+
+    def delete(self, session_id):
+        """Remove the session if present."""
+        self._sessions.pop(session_id, None)
+        self._deadlines.pop(session_id, None)
+
+
+class RedisSessionStore:
+    """
+    Redis-backed store so recordings survive multi-worker routing.
+
+    Sessions are hashes with per-field JSON values, which keeps integers in
+    a form HINCRBY understands so counters can be bumped atomically without
+    a read-modify-write race between concurrent chunk uploads.
+    """
+
+    def __init__(self, url):
+        pool = redis.BlockingConnectionPool.from_url(
+            url, max_connections=32, decode_responses=True
+        )
+        self._redis = redis.Redis(connection_pool=pool)
+
+    def _key(self, session_id):
+        return f'recording:session:{session_id}'
+
+    def get(self, session_id):
+        """Return the session dict, or None if unknown/expired."""
+        raw = self._redis.hgetall(self._key(session_id))
+        if not raw:
+            return None
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    def set(self, session_id, data, ttl=SESSION_TTL_SECONDS):
+        """Store (or replace) the session fields and refresh the TTL."""
+        key = self._key(session_id)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hset(key, mapping={
+            field: json.dumps(value) for field, value in data.items()
+        })
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+    def increment(self, session_id, field, amount=1):
+        """Atomically add ``amount`` to a numeric field (HINCRBY)."""
+        return self._redis.hincrby(self._key(session_id), field, amount)
+
+    def delete(self, session_id):
+        """Remove the session if present."""
+        self._redis.delete(self._key(session_id))
+
+
+def create_session_store(redis_url=None):
+    """
+    Build the session store for an application.
+
+    Args:
+        redis_url: Optional Redis connection URL (e.g. redis://localhost:6379/0)
+
+    Returns:
+        RedisSessionStore when a URL is configured and redis is installed,
+        otherwise an InMemorySessionStore
+    """
+    if redis_url:
+        if REDIS_AVAILABLE:
+            return RedisSessionStore(redis_url)
+        logger.warning(
+            "REDIS_URL configured but the redis package is not installed; "
+            "falling back to in-memory session store"
+        )
+    return InMemorySessionStore()
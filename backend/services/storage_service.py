@@ -8,15 +8,19 @@ This service provides functionality for:
 - Managing file storage with unique filenames
 """
 
+import binascii
+import hashlib
 import os
-import base64
 import uuid
-from datetime import datetime
 from PIL import Image
 from io import BytesIO
 from typing import Tuple
 
 
+# PNG file signature; uploads that already carry it are written verbatim
+_PNG_MAGIC = b'\x89PNG\r\n\x1a\n'
+
+
 class StorageService:
     """Service for managing file storage operations."""
     
@@ -24,6 +28,9 @@ class StorageService:
         """
         Initialize the storage service.
         
+        The directories are expected to exist already (create_app ensures
+        them once at startup), so construction does no filesystem work.
+
         Args:
             images_folder: Path to the images storage directory
             audio_folder: Path to the audio storage directory
@@ -32,47 +39,92 @@ class StorageService:
         self.images_folder = images_folder
         self.audio_folder = audio_folder
         self.thumbnails_folder = thumbnails_folder
-        
-        # Ensure directories exist
-        os.makedirs(self.images_folder, exist_ok=True)
-        os.makedirs(self.audio_folder, exist_ok=True)
-        os.makedirs(self.thumbnails_folder, exist_ok=True)
     
-    def save_image(self, base64_data: str) -> str:
+    def save_image(self, base64_data) -> str:
         """
         Decode Base64 image data and save as PNG file.
-        
+
         Args:
-            base64_data: Base64 encoded image string (with or without data URI prefix)
-        
+            base64_data: Base64 encoded image payload, str or bytes-like
+                (with or without data URI prefix)
+
         Returns:
             URL path to the saved image in format /static/images/{filename}
-        
+
         Raises:
             ValueError: If base64_data is invalid or cannot be decoded
         """
         try:
-            # Remove data URI prefix if present
-            if ',' in base64_data:
-                base64_data = base64_data.split(',', 1)[1]
-            
-            # Decode Base64 data
-            image_bytes = base64.b64decode(base64_data)
-            
-            # Generate unique filename
-            filename = self._generate_unique_filename('png')
+            # Normalize to bytes once; everything after is copy-free
+            if isinstance(base64_data, str):
+                base64_data = base64_data.encode('ascii')
+
+            # Remove data URI prefix if present; the memoryview slice skips
+            # the multi-MB copy a split would make
+            comma = base64_data.find(b',')
+            if comma >= 0:
+                base64_data = memoryview(base64_data)[comma + 1:]
+
+            # a2b_base64 decodes the view directly, without b64decode's
+            # extra altchars-translate pass
+            image_bytes = binascii.a2b_base64(base64_data)
+
+            # Content-addressed filename: consecutive steps often capture
+            # identical pixels (hover then click with no scroll), so keying
+            # the file by a blake2b digest of the upload makes repeats cost
+            # a hash plus a stat instead of another multi-MB write
+            digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+            filename = f'{digest}.png'
             filepath = os.path.join(self.images_folder, filename)
-            
-            # Open image and save as PNG
-            image = Image.open(BytesIO(image_bytes))
-            image.save(filepath, 'PNG')
-            
+
+            if not os.path.exists(filepath):
+                if image_bytes[:8] == _PNG_MAGIC:
+                    # Already a PNG: write the bytes verbatim and skip the
+                    # PIL decode + zlib re-deflate round trip entirely
+                    self._write_atomic(filepath, image_bytes)
+                else:
+                    # Other formats (jpeg/webp) need conversion to PNG
+                    image = Image.open(BytesIO(image_bytes))
+                    buffer = BytesIO()
+                    image.save(buffer, 'PNG')
+                    self._write_atomic(filepath, buffer.getvalue())
+
             # Return URL path
             return f'/static/images/{filename}'
         
         except Exception as e:
             raise ValueError(f"Failed to save image: {str(e)}")
     
+    def save_image_stream(self, file_storage) -> str:
+        """
+        Save an uploaded image file part directly to storage.
+
+        Used for multipart uploads where the PNG arrives as raw bytes; the
+        data streams from Werkzeug's spooled temp file to disk with no
+        Base64 decode and no re-encode.
+
+        Args:
+            file_storage: Werkzeug FileStorage from a multipart request
+
+        Returns:
+            URL path to the saved image in format /static/images/{filename}
+
+        Raises:
+            ValueError: If the file cannot be saved
+        """
+        try:
+            # Generate unique filename
+            filename = self._generate_unique_filename('png')
+            filepath = os.path.join(self.images_folder, filename)
+
+            file_storage.save(filepath)
+
+            # Return URL path
+            return f'/static/images/{filename}'
+
+        except Exception as e:
+            raise ValueError(f"Failed to save image: {str(e)}")
+
     def save_audio(self, audio_data: bytes, extension: str = 'mp3') -> str:
         """
         Save audio file to storage.
@@ -128,18 +180,25 @@ class StorageService:
             if not os.path.exists(source_path):
                 raise ValueError(f"Source image not found: {source_path}")
             
-            # Open image
+            # Open image; draft() pre-shrinks during decode for codecs that
+            # support it (JPEG) and is a free no-op for PNG
             image = Image.open(source_path)
-            
-            # Create thumbnail (maintains aspect ratio)
-            image.thumbnail(size, Image.Resampling.LANCZOS)
-            
+            image.draft('RGB', (size[0] * 2, size[1] * 2))
+
+            # Create thumbnail (maintains aspect ratio); BICUBIC on top of
+            # thumbnail()'s built-in box pre-reduce is visually fine at
+            # 320x180 and much cheaper than a full-resolution LANCZOS pass
+            image.thumbnail(size, Image.Resampling.BICUBIC)
+
             # Generate unique filename for thumbnail
-            filename = self._generate_unique_filename('png')
+            filename = self._generate_unique_filename('webp')
             thumbnail_path = os.path.join(self.thumbnails_folder, filename)
-            
-            # Save thumbnail
-            image.save(thumbnail_path, 'PNG')
+
+            # Save as WebP: 5-15x smaller than PNG at thumbnail size, which
+            # cuts both encode CPU and the bytes served to the dashboard
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGB')
+            image.save(thumbnail_path, 'WEBP', quality=80, method=4)
             
             # Return URL path
             return f'/static/thumbnails/{filename}'
@@ -147,16 +206,32 @@ class StorageService:
         except Exception as e:
             raise ValueError(f"Failed to generate thumbnail: {str(e)}")
     
+    @staticmethod
+    def _write_atomic(filepath: str, data: bytes) -> None:
+        """
+        Write bytes to a temp file and rename it into place.
+
+        rename(2) is atomic within a filesystem, so a concurrent upload of
+        the same content never observes a half-written file at the shared
+        content-addressed path.
+        """
+        temp_path = f'{filepath}.{uuid.uuid4().hex}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, filepath)
+
     def _generate_unique_filename(self, extension: str) -> str:
         """
-        Generate a unique filename using UUID and timestamp.
-        
+        Generate a unique filename from a random UUID.
+
+        UUID4 alone carries 122 bits of entropy; the timestamp suffix the
+        old format appended only lengthened directory entries (and cost a
+        strftime call) without adding uniqueness.
+
         Args:
             extension: File extension (without dot)
-        
+
         Returns:
-            Unique filename in format {uuid}_{timestamp}.{extension}
+            Unique filename in format {uuid}.{extension}
         """
-        unique_id = uuid.uuid4().hex
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return f"{unique_id}_{timestamp}.{extension}"
+        return f"{uuid.uuid4().hex}.{extension}"
@@ -8,11 +8,19 @@ This service provides functionality for:
 - Handling TTS failures gracefully
 """
 
+import base64
+import hashlib
+import importlib.util
+import json
 import os
-import tempfile
-import math
-from typing import Optional, Tuple
-from gtts import gTTS
+import re
+import struct
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import List, Optional, Tuple
 import logging
 
 from services.storage_service import StorageService
@@ -21,14 +29,147 @@ from services.storage_service import StorageService
 logger = logging.getLogger(__name__)
 
 
-try:
-    from mutagen.mp3 import MP3
-    MUTAGEN_AVAILABLE = True
-except ImportError:
-    MUTAGEN_AVAILABLE = False
+# find_spec answers availability without paying for the import; the MP3
+# class itself loads lazily on the first duration calculation
+MUTAGEN_AVAILABLE = importlib.util.find_spec('mutagen') is not None
+if not MUTAGEN_AVAILABLE:
     logger.warning("mutagen not available, using fallback duration calculation")
 
 
+# Bound on cached TTS results; entries are tiny (hash -> url/frames tuple)
+# but the LRU keeps a pathological session from growing without limit
+_CACHE_MAX_ENTRIES = 256
+
+
+# gTTS calls are pure network I/O, so batch generation overlaps the HTTPS
+# round trips on a small shared pool instead of paying them serially
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+
+# The name generate_audio instantiates (and tests patch). Resolved lazily
+# by _resolve_gtts: importing gtts drags in requests/urllib3/click, a cost
+# previously paid at every create_app even when no audio was generated
+gTTS = None
+_HTTP_SESSION = None
+
+
+def _resolve_gtts():
+    """Import gtts on first use and build the pooled subclass, once."""
+    global gTTS, _HTTP_SESSION
+    if gTTS is not None:
+        return gTTS
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    from gtts import gTTS as _BaseGTTS
+    from gtts.tts import gTTSError
+
+    # Shared HTTP transport for the TTS API: keep-alive plus a small
+    # connection pool amortizes the TCP/TLS handshake across generations
+    # instead of paying it on every call
+    _HTTP_SESSION = requests.Session()
+    _HTTP_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+    class _PooledGTTS(_BaseGTTS):
+        """
+        gTTS that sends its API requests through the shared pooled session.
+
+        Upstream gTTS opens and closes a fresh requests.Session per part,
+        so every generation renegotiates TCP + TLS; routing the same
+        prepared requests through _HTTP_SESSION reuses warm connections.
+        The response parsing mirrors upstream stream().
+        """
+
+        def stream(self):
+            for idx, prepared in enumerate(self._prepare_requests()):
+                try:
+                    response = _HTTP_SESSION.send(
+                        request=prepared,
+                        proxies=urllib.request.getproxies(),
+                        timeout=self.timeout,
+                    )
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError as e:
+                    # Request successful, bad response
+                    logger.debug(str(e))
+                    raise gTTSError(tts=self, response=response)
+                except requests.exceptions.RequestException as e:
+                    # Request failed
+                    logger.debug(str(e))
+                    raise gTTSError(tts=self)
+
+                for line in response.iter_lines(chunk_size=1024):
+                    decoded_line = line.decode('utf-8')
+                    if 'jQ1olc' in decoded_line:
+                        audio_search = re.search(r'jQ1olc","\[\\"(.*)\\"]', decoded_line)
+                        if audio_search:
+                            yield base64.b64decode(audio_search.group(1).encode('ascii'))
+                        else:
+                            # Request successful, good response, no audio stream
+                            raise gTTSError(tts=self, response=response)
+                logger.debug("part-%i created", idx)
+
+    gTTS = _PooledGTTS
+    return gTTS
+
+
+# MPEG Layer III header tables (kbps / Hz), indexed by the 4-bit bitrate
+# and 2-bit sample-rate fields; version bits: 3 = MPEG-1, 2 = MPEG-2,
+# 0 = MPEG-2.5 (gTTS emits MPEG-2 at 24 kHz)
+_MP3_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MP3_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_duration_from_bytes(data: bytes) -> float:
+    """
+    Duration in seconds of an MPEG Layer III stream via a header scan.
+
+    Walks frame headers (sync word plus table lookups) accumulating
+    samples / sample_rate per frame — a single O(n) pass with no audio
+    decode, and correct for VBR streams where a size/bitrate estimate
+    is wildly off. Returns 0.0 when no parseable frames are found.
+    """
+    offset = 0
+    end = len(data)
+
+    # Skip a leading ID3v2 tag (syncsafe 28-bit size at bytes 6-9)
+    if data[:3] == b'ID3' and end >= 10:
+        tag_size = ((data[6] & 0x7F) << 21) | ((data[7] & 0x7F) << 14) | \
+                   ((data[8] & 0x7F) << 7) | (data[9] & 0x7F)
+        offset = 10 + tag_size
+
+    duration = 0.0
+    while offset + 4 <= end:
+        header = struct.unpack_from('>I', data, offset)[0]
+
+        # Resync byte-by-byte until the 11-bit sync word lines up and the
+        # header fields are valid Layer III values
+        version = (header >> 19) & 0x3
+        layer = (header >> 17) & 0x3
+        bitrate_index = (header >> 12) & 0xF
+        samplerate_index = (header >> 10) & 0x3
+        if (header >> 21 != 0x7FF or version == 1 or layer != 1
+                or bitrate_index in (0, 15) or samplerate_index == 3):
+            offset += 1
+            continue
+
+        bitrate = (_MP3_BITRATES_V1 if version == 3 else _MP3_BITRATES_V2)[bitrate_index] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][samplerate_index]
+        samples = 1152 if version == 3 else 576
+        padding = (header >> 9) & 0x1
+
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+        if frame_length <= 4:
+            offset += 1
+            continue
+
+        duration += samples / sample_rate
+        offset += frame_length
+
+    return duration
+
+
 class TTSService:
     """Service for text-to-speech conversion and audio management."""
     
@@ -42,7 +183,25 @@ class TTSService:
         """
         self.storage_service = storage_service
         self.fps = fps
-    
+        # LRU of successful generations keyed by SHA-256 of language plus
+        # normalized text; repeated captions ("Perform click action") skip
+        # the network call and the audio write entirely. Guarded because
+        # generate_audio runs on pool threads. A sidecar JSON index in the
+        # audio folder persists the map so hits survive restarts — the MP3s
+        # themselves already do.
+        self._audio_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_path = os.path.join(storage_service.audio_folder, '.tts_cache.json')
+        self._load_cache()
+        # Bounded LRU for duration parses keyed by a digest of the audio
+        # bytes; identical MP3s skip the mutagen/frame-scan pass entirely
+        self._duration_cache = OrderedDict()
+        # Pick the measurement path once at construction instead of
+        # re-testing MUTAGEN_AVAILABLE on every call
+        self._measure_duration = (
+            self._measure_mutagen if MUTAGEN_AVAILABLE else self._measure_fallback
+        )
+
     def generate_audio(self, text: str, language: str = 'en') -> Optional[Tuple[str, int]]:
         """
         Generate TTS audio from text and save to storage.
@@ -61,68 +220,170 @@ class TTSService:
         if not text or not text.strip():
             logger.warning("Empty text provided for TTS generation")
             return None
-        
+
+        # Normalize so trivial variants ("Click Submit " vs "click submit")
+        # share one rendering; NUL separator keeps language/text unambiguous
+        normalized = text.strip().lower()
+        cache_key = hashlib.sha256(f'{language}\0{normalized}'.encode('utf-8')).hexdigest()
+        with self._cache_lock:
+            cached = self._audio_cache.get(cache_key)
+            if cached is not None:
+                self._audio_cache.move_to_end(cache_key)
+                return cached
+
         try:
-            # Generate TTS audio
-            tts = gTTS(text=text, lang=language, slow=False)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                temp_path = temp_file.name
-                tts.save(temp_path)
-            
-            # Read audio data
-            with open(temp_path, 'rb') as f:
-                audio_data = f.read()
-            
+            # Generate TTS audio, rendered straight into memory; the old
+            # temp-file round trip wrote, re-read, re-parsed and unlinked
+            # bytes that save_audio was about to write again anyway.
+            # (gTTS is truthy once resolved or when patched by tests.)
+            tts_class = gTTS or _resolve_gtts()
+            tts = tts_class(text=text, lang=language, slow=False)
+            # Iterate the decoded parts straight off the wire; write_to_fp
+            # is only a wrapper around this same loop
+            buffer = BytesIO()
+            for chunk in tts.stream():
+                buffer.write(chunk)
+            audio_data = buffer.getvalue()
+
             # Calculate duration in frames
-            duration_frames = self.calculate_duration_frames(temp_path)
-            
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
+            duration_frames = self._duration_frames_from_bytes(audio_data)
+
             # Save audio using StorageService
             audio_url = self.storage_service.save_audio(audio_data, extension='mp3')
             
             logger.info(f"Generated TTS audio: {audio_url}, duration: {duration_frames} frames")
+
+            # Only successes are cached; failures should retry next time
+            with self._cache_lock:
+                self._audio_cache[cache_key] = (audio_url, duration_frames)
+                if len(self._audio_cache) > _CACHE_MAX_ENTRIES:
+                    self._audio_cache.popitem(last=False)
+                self._persist_cache()
+
             return (audio_url, duration_frames)
         
         except Exception as e:
             logger.warning(f"TTS generation failed for text '{text[:50]}...': {str(e)}")
             return None
     
+    def generate_audio_batch(self, items: List[Tuple[str, str]]) -> List[Optional[Tuple[str, int]]]:
+        """
+        Generate TTS audio for several (text, language) pairs concurrently.
+
+        Args:
+            items: List of (text, language) tuples
+
+        Returns:
+            List of generate_audio results in input order; a failed or
+            empty item yields None in its slot, same as generate_audio
+
+        Note:
+            With N items the wall-clock cost is roughly one network round
+            trip instead of N, since the calls overlap on the shared pool.
+        """
+        return list(_BATCH_EXECUTOR.map(
+            lambda item: self.generate_audio(*item), items
+        ))
+
+    def _load_cache(self) -> None:
+        """
+        Warm the result cache from the sidecar index, if one exists.
+
+        Entries whose audio file has since been deleted are skipped so a
+        cleaned storage folder never serves dangling URLs.
+        """
+        try:
+            with open(self._cache_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, entry in stored.items():
+            audio_url, duration_frames = entry
+            filename = audio_url.split('/')[-1]
+            if os.path.exists(os.path.join(self.storage_service.audio_folder, filename)):
+                self._audio_cache[key] = (audio_url, duration_frames)
+
+    def _persist_cache(self) -> None:
+        """Write the cache index to disk; caller holds the cache lock."""
+        try:
+            with open(self._cache_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(self._audio_cache), f)
+        except OSError as e:
+            logger.warning(f"Failed to persist TTS cache index: {str(e)}")
+
     def calculate_duration_frames(self, audio_path: str) -> int:
         """
         Calculate the duration of an audio file in frames.
-        
+
         Args:
             audio_path: Path to the audio file
-        
+
         Returns:
             Duration in frames (rounded up to nearest frame)
-        
+
         Note:
             Uses 30 FPS by default. Duration is calculated as:
             duration_frames = ceil(audio_duration_seconds * fps)
         """
         try:
-            if MUTAGEN_AVAILABLE:
-                # Use mutagen to get accurate duration
-                audio = MP3(audio_path)
-                duration_seconds = audio.info.length
-            else:
-                # Fallback: estimate based on file size
-                # Average MP3 bitrate is ~128 kbps = 16 KB/s
-                file_size = os.path.getsize(audio_path)
-                duration_seconds = file_size / 16000  # Rough estimate
-            
-            # Convert to frames (round up)
-            duration_frames = math.ceil(duration_seconds * self.fps)
-            
+            with open(audio_path, 'rb') as f:
+                audio_data = f.read()
+        except OSError as e:
+            logger.error(f"Failed to read audio file for duration: {str(e)}")
+            # Return default duration (3 seconds) if calculation fails
+            return 90  # 3 seconds * 30 fps
+
+        return self._duration_frames_from_bytes(audio_data)
+
+    def _duration_frames_from_bytes(self, audio_data: bytes) -> int:
+        """
+        Calculate duration in frames for MP3 bytes already in memory.
+
+        mutagen accepts file-like objects, so generate_audio can measure
+        its in-memory buffer without a temp file on disk. Results are
+        memoized by SHA-1 of the bytes, so re-measuring an identical MP3
+        is a dict lookup rather than another header parse.
+        """
+        digest = hashlib.sha1(audio_data).digest()
+        with self._cache_lock:
+            cached = self._duration_cache.get(digest)
+            if cached is not None:
+                self._duration_cache.move_to_end(digest)
+                return cached
+
+        try:
+            duration_seconds = self._measure_duration(audio_data)
+
+            # Convert to frames, rounding up: ceiling division over integer
+            # milliseconds keeps the math branchless and FP-free (sub-ms
+            # precision is far below one frame at 30 fps)
+            duration_ms = int(duration_seconds * 1000)
+            duration_frames = (duration_ms * self.fps + 999) // 1000
+
+            # Successes only; a failed parse should retry next time
+            with self._cache_lock:
+                self._duration_cache[digest] = duration_frames
+                if len(self._duration_cache) > _CACHE_MAX_ENTRIES:
+                    self._duration_cache.popitem(last=False)
+
             return duration_frames
-        
+
         except Exception as e:
             logger.error(f"Failed to calculate audio duration: {str(e)}")
             # Return default duration (3 seconds) if calculation fails
             return 90  # 3 seconds * 30 fps
 
+    def _measure_mutagen(self, audio_data: bytes) -> float:
+        """Seconds via mutagen's parser (imported on first use)."""
+        from mutagen.mp3 import MP3
+        return MP3(BytesIO(audio_data)).info.length
+
+    def _measure_fallback(self, audio_data: bytes) -> float:
+        """Seconds via the frame-header scan, size estimate as last resort."""
+        duration_seconds = _mp3_duration_from_bytes(audio_data)
+        if duration_seconds <= 0.0:
+            # No parseable frames; estimate at ~128 kbps = 16 KB/s
+            duration_seconds = len(audio_data) / 16000
+        return duration_seconds
+
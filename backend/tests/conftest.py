@@ -1,35 +1,141 @@
+import os
+
+import orjson
 import pytest
 from app import create_app
 from models import Base, Folder, FolderType
+from services.storage_service import StorageService
+from services.tts_service import TTSService
 
 
-@pytest.fixture
-def app():
-    """Create application for testing."""
+# The system folder names every test database is seeded with; frozen so
+# assertions can compare against it without rebuilding a set per test
+SYSTEM_FOLDER_NAMES = frozenset({'All Flows', 'Trash'})
+
+
+def _json(response):
+    """Parse a test-client response body with orjson.
+
+    Skips the MIME sniffing Flask's response.get_json() does on every
+    call and parses with the same C-level decoder the app itself uses.
+    """
+    return orjson.loads(response.data)
+
+
+@pytest.fixture(scope='session')
+def _app_instance():
+    """Create the application and schema once for the whole test session.
+
+    Running create_all/drop_all per test made schema DDL dominate the
+    suite's wall clock; the schema is pure setup, so build it once and
+    reset only the data between tests.
+    """
     app = create_app('testing')
-    
-    # Create all tables for testing
+
+    # Under pytest-xdist (pytest -n auto) each worker is its own process,
+    # so the in-memory SQLite database is isolated for free; the static
+    # folders live on shared disk, so give each worker its own set to keep
+    # named file writes from colliding.
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker:
+        for key in ('IMAGES_FOLDER', 'AUDIO_FOLDER', 'THUMBNAILS_FOLDER'):
+            app.config[key] = f"{app.config[key]}_{worker}"
+            os.makedirs(app.config[key], exist_ok=True)
+
+        storage_service = StorageService(
+            images_folder=app.config['IMAGES_FOLDER'],
+            audio_folder=app.config['AUDIO_FOLDER'],
+            thumbnails_folder=app.config['THUMBNAILS_FOLDER']
+        )
+        app.extensions['storage_service'] = storage_service
+        app.extensions['tts_service'] = TTSService(
+            storage_service=storage_service,
+            fps=app.config['VIDEO_FPS']
+        )
+
     with app.app_context():
         Base.metadata.create_all(app.db_engine)
-        
+
+    yield app
+
+    with app.app_context():
+        app.db_session.close()
+        Base.metadata.drop_all(app.db_engine)
+
+
+@pytest.fixture
+def app(_app_instance):
+    """Yield the shared app with empty tables and fresh system folders.
+
+    Row deletes are far cheaper than the old per-test DDL round trip and
+    leave each test with exactly the state the old fixture provided.
+    """
+    app = _app_instance
+
+    # Push one app context for the whole test instead of every test body
+    # opening (and tearing down) its own `with app.app_context():` block;
+    # tests that still open one simply nest, which Flask supports
+    ctx = app.app_context()
+    ctx.push()
+    try:
+        # Discard any state a previous test left on the long-lived session
+        app.db_session.rollback()
+        app.db_session.expunge_all()
+
+        with app.db_engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+
         # Seed system folders
         all_flows = Folder(name='All Flows', type=FolderType.SYSTEM)
         trash = Folder(name='Trash', type=FolderType.SYSTEM)
         app.db_session.add(all_flows)
         app.db_session.add(trash)
         app.db_session.commit()
-    
-    yield app
-    
-    # Drop all tables after testing
-    with app.app_context():
-        Base.metadata.drop_all(app.db_engine)
+
+        # Prime the app's system-folder-ID cache straight from the seeded
+        # rows; this both replaces the stale pre-wipe entries and saves the
+        # first-lookup SELECT for every test that resolves these IDs
+        app.extensions['system_folder_ids'] = {
+            all_flows.name: all_flows.id,
+            trash.name: trash.id
+        }
+
+        yield app
+    finally:
+        ctx.pop()
 
 
 @pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
+def system_folders(app):
+    """Name -> id mapping for the seeded system folders.
+
+    Served from the cache the app fixture primed at seed time, so tests
+    resolving 'All Flows'/'Trash' IDs issue no SELECT at all. Function
+    scoped of necessity: the per-test reseed reassigns the IDs.
+    """
+    return dict(app.extensions['system_folder_ids'])
+
+
+@pytest.fixture(scope='session')
+def _client_instance(_app_instance):
+    """Build one Werkzeug test client for the whole session.
+
+    test_client() allocates a client, environ builder and cookie storage
+    per call; nothing here is per-test state (the API sets no cookies),
+    so one instance serves every request in the run.
+    """
+    return _app_instance.test_client()
+
+
+@pytest.fixture
+def client(app, _client_instance):
+    """Yield the shared test client against freshly reset data.
+
+    Function-scoped wrapper for the same reason as `app`: depending on
+    it must still trigger the per-test data reset.
+    """
+    return _client_instance
 
 
 @pytest.fixture
@@ -40,4 +146,3 @@ def db_session(app):
         yield session
         # Rollback any uncommitted changes
         session.rollback()
-        session.remove()
@@ -4,7 +4,7 @@ Basic tests for Flask application initialization.
 import pytest
 import os
 import tempfile
-from hypothesis import given, strategies as st, settings, HealthCheck
+from contextlib import suppress
 
 
 def test_app_creation(app):
@@ -31,6 +31,39 @@ def test_404_error_handler(client):
     assert data['error'] == 'Not Found'
 
 
+def test_compiled_statement_cache_active(app):
+    """Test that repeated queries hit the compiled-statement cache.
+
+    Every enum/custom column type must be cacheable for this to hold;
+    a silent fall-off to per-execution compilation would show up here
+    as a second CACHE_MISS.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine.interfaces import CacheStats
+    from models import Folder, FolderType
+
+    stats = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        stats.append(context.cache_hit)
+
+    event.listen(app.db_engine, 'before_cursor_execute', record)
+    try:
+        with app.app_context():
+            for name in ('All Flows', 'Trash'):
+                app.db_session.query(Folder).filter(
+                    Folder.name == name,
+                    Folder.type == FolderType.SYSTEM
+                ).first()
+    finally:
+        event.remove(app.db_engine, 'before_cursor_execute', record)
+
+    assert len(stats) == 2
+    # The first execution may compile; the identical second one must not
+    assert stats[1] is CacheStats.CACHE_HIT, \
+        f"Identical statement should be a cache hit, got: {stats[1]}"
+
+
 def test_config_loading(app):
     """Test that configuration is loaded correctly."""
     assert 'SQLALCHEMY_DATABASE_URI' in app.config
@@ -40,73 +73,85 @@ def test_config_loading(app):
     assert app.config['VIDEO_FPS'] == 30
 
 
+# The closed set of names the MIME tests exercise, shared by the fixture
+# that creates them and the parametrize that requests them
+_MIME_TEST_FILENAMES = [
+    'test_image.png',
+    'test_audio.mp3',
+    'screenshot_12345.png',
+    'audio_67890.mp3',
+    'thumbnail_abc.png'
+]
+
+
+@pytest.fixture(scope='module')
+def static_test_files(_app_instance):
+    """Create every (folder, filename) MIME test file once per module.
+
+    The contents never change, so writing and unlinking them per test
+    case was pure syscall churn; 15 writes happen once and one teardown
+    sweep removes them.
+    """
+    folder_map = {
+        'images': _app_instance.config['IMAGES_FOLDER'],
+        'audio': _app_instance.config['AUDIO_FOLDER'],
+        'thumbnails': _app_instance.config['THUMBNAILS_FOLDER']
+    }
+
+    created = {}
+    for folder, folder_path in folder_map.items():
+        for filename in _MIME_TEST_FILENAMES:
+            file_path = os.path.join(folder_path, filename)
+            with open(file_path, 'wb') as f:
+                if filename.endswith('.png'):
+                    # Minimal PNG header
+                    f.write(b'\x89PNG\r\n\x1a\n')
+                elif filename.endswith('.mp3'):
+                    # Minimal MP3 header
+                    f.write(b'\xff\xfb')
+            created[(folder, filename)] = file_path
+
+    yield created
+
+    # One unlink per file; suppress saves the extra stat an exists()
+    # pre-check would cost
+    for file_path in created.values():
+        with suppress(FileNotFoundError):
+            os.unlink(file_path)
+
+
 class TestStaticFileMimeTypes:
     """Property tests for static file MIME types."""
-    
+
     # Feature: acro-saas-demo-video-tool, Property 33: Static file MIME types
-    @given(
-        filename=st.sampled_from([
-            'test_image.png',
-            'test_audio.mp3',
-            'screenshot_12345.png',
-            'audio_67890.mp3',
-            'thumbnail_abc.png'
-        ]),
-        folder=st.sampled_from(['images', 'audio', 'thumbnails'])
-    )
-    @settings(
-        max_examples=100,
-        suppress_health_check=[HealthCheck.function_scoped_fixture]
-    )
-    def test_static_file_mime_types(self, client, app, filename, folder):
+    # The input space is 5 filenames x 3 folders = 15 cases, so a plain
+    # parametrize covers it exhaustively; Hypothesis with max_examples=100
+    # just replayed duplicates
+    @pytest.mark.parametrize('filename', _MIME_TEST_FILENAMES)
+    @pytest.mark.parametrize('folder', ['images', 'audio', 'thumbnails'])
+    def test_static_file_mime_types(self, client, static_test_files, filename, folder):
         """For any request to /static/* routes, should return correct Content-Type header."""
-        # Create a temporary file in the appropriate folder
-        folder_map = {
-            'images': app.config['IMAGES_FOLDER'],
-            'audio': app.config['AUDIO_FOLDER'],
-            'thumbnails': app.config['THUMBNAILS_FOLDER']
-        }
-        
-        file_path = os.path.join(folder_map[folder], filename)
-        
-        # Create the file with minimal content
-        with open(file_path, 'wb') as f:
-            if filename.endswith('.png'):
-                # Minimal PNG header
-                f.write(b'\x89PNG\r\n\x1a\n')
-            elif filename.endswith('.mp3'):
-                # Minimal MP3 header
-                f.write(b'\xff\xfb')
-        
-        try:
-            # Make request to static file endpoint
-            response = client.get(f'/static/{folder}/{filename}')
-            
-            # Verify response
-            assert response.status_code == 200
-            
-            # Verify correct MIME type based on file extension
-            if filename.endswith('.png'):
-                assert response.content_type == 'image/png'
-            elif filename.endswith('.mp3'):
-                assert response.content_type == 'audio/mpeg'
-        finally:
-            # Clean up the test file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        assert (folder, filename) in static_test_files
+
+        # Make request to static file endpoint
+        response = client.get(f'/static/{folder}/{filename}')
+
+        # Verify response
+        assert response.status_code == 200
+
+        # Verify correct MIME type based on file extension
+        if filename.endswith('.png'):
+            assert response.content_type == 'image/png'
+        elif filename.endswith('.mp3'):
+            assert response.content_type == 'audio/mpeg'
 
 
 class TestErrorResponseMapping:
     """Property tests for error response mapping."""
     
     # Feature: acro-saas-demo-video-tool, Property 34: Error response mapping
-    @given(
-        error_code=st.sampled_from([400, 404, 500, 503])
-    )
-    @settings(
-        max_examples=100,
-        suppress_health_check=[HealthCheck.function_scoped_fixture]
-    )
+    # Four enumerable codes; parametrize runs each exactly once
+    @pytest.mark.parametrize('error_code', [400, 404, 500, 503])
     def test_error_response_structure(self, client, app, error_code):
         """For any API error response, should return proper error structure."""
         # Trigger different error codes
@@ -15,48 +15,70 @@ import json
 import base64
 import os
 from io import BytesIO
+from unittest.mock import MagicMock, patch
 from PIL import Image
-from app import create_app
-from models import Base, Project, Folder, FolderType, Step
+from sqlalchemy import exists
+from models import Project, Folder, Step, ActionType
+
+
+@pytest.fixture(scope='session')
+def sample_screenshot():
+    """Generate a sample screenshot as Base64, once for the whole session.
+
+    The payload is pure data shared read-only by every test, so there is
+    no reason to re-encode it per test; a small solid-color frame drives
+    the same code paths as a 1920x1080 capture with ~36x fewer pixels for
+    Pillow and Base64 to chew through.
+    """
+    img = Image.new('RGB', (320, 180), color='blue')
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    img_bytes = buffer.getvalue()
+    base64_str = base64.b64encode(img_bytes).decode('utf-8')
+    return f"data:image/png;base64,{base64_str}"
 
 
 class TestEndToEndIntegration:
-    """Test complete flow across all components"""
-    
+    """Test complete flow across all components.
+
+    Uses the shared conftest app/client fixtures: the app and schema are
+    built once per session and only the data resets between tests, instead
+    of this class rebuilding the app and running DDL for every test.
+    """
+
     @pytest.fixture
-    def app(self):
-        """Create test application"""
-        app = create_app('testing')
-        
+    def recorded_project(self, app, client, sample_screenshot):
+        """Record a one-step project via the API and return its identifiers.
+
+        Shared prologue for the consistency tests below. Function-scoped on
+        purpose: the consumers soft-delete, move and edit the project, so
+        sharing one instance across tests would leak state between them.
+        """
         with app.app_context():
-            Base.metadata.create_all(app.db_engine)
-            
-            # Create system folders
-            all_flows = Folder(name='All Flows', type=FolderType.SYSTEM)
-            trash = Folder(name='Trash', type=FolderType.SYSTEM)
-            app.db_session.add(all_flows)
-            app.db_session.add(trash)
-            app.db_session.commit()
-            
-            yield app
-            
-            Base.metadata.drop_all(app.db_engine)
-    
-    @pytest.fixture
-    def client(self, app):
-        """Create test client"""
-        return app.test_client()
-    
-    @pytest.fixture
-    def sample_screenshot(self):
-        """Generate a sample screenshot as Base64"""
-        img = Image.new('RGB', (1920, 1080), color='blue')
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        img_bytes = buffer.getvalue()
-        base64_str = base64.b64encode(img_bytes).decode('utf-8')
-        return f"data:image/png;base64,{base64_str}"
-    
+            response = client.post('/api/recording/start')
+            session_id = response.get_json()['sessionId']
+
+            client.post('/api/recording/chunk',
+                       json={
+                           'sessionId': session_id,
+                           'orderIndex': 1,
+                           'actionType': 'click',
+                           'targetText': 'Test',
+                           'posX': 100,
+                           'posY': 100,
+                           'viewportWidth': 1920,
+                           'viewportHeight': 1080,
+                           'screenshotBase64': sample_screenshot
+                       },
+                       content_type='application/json')
+
+            response = client.post('/api/recording/stop',
+                                  json={'sessionId': session_id},
+                                  content_type='application/json')
+            stop_data = response.get_json()
+
+        return stop_data['projectId'], stop_data['uuid'], session_id
+
     def test_complete_recording_to_editor_flow(self, app, client, sample_screenshot):
         """
         Test complete flow: Start recording → Capture steps → Stop recording → 
@@ -64,7 +86,11 @@ class TestEndToEndIntegration:
         
         Validates: Requirements All (end-to-end integration)
         """
-        with app.app_context():
+        # Stub gTTS so the background audio patches (joined by /stop) land
+        # deterministically instead of depending on a real network round trip
+        mock_tts = MagicMock()
+        mock_tts.stream.return_value = [b'ID3\x04\x00\x00\x00\x00\x00\x00', b'\x00' * 16000]
+        with patch('services.tts_service.gTTS', return_value=mock_tts), app.app_context():
             # Step 1: Extension starts recording session
             response = client.post('/api/recording/start')
             assert response.status_code == 200
@@ -73,10 +99,9 @@ class TestEndToEndIntegration:
             assert data['status'] == 'active'
             session_id = data['sessionId']
             
-            # Step 2: Extension captures multiple steps
+            # Step 2: Extension uploads all captured steps in one batch
             steps_data = [
                 {
-                    'sessionId': session_id,
                     'orderIndex': 1,
                     'actionType': 'click',
                     'targetText': 'Login Button',
@@ -87,7 +112,6 @@ class TestEndToEndIntegration:
                     'screenshotBase64': sample_screenshot
                 },
                 {
-                    'sessionId': session_id,
                     'orderIndex': 2,
                     'actionType': 'click',
                     'targetText': 'Submit Form',
@@ -98,7 +122,6 @@ class TestEndToEndIntegration:
                     'screenshotBase64': sample_screenshot
                 },
                 {
-                    'sessionId': session_id,
                     'orderIndex': 3,
                     'actionType': 'click',
                     'targetText': 'Dashboard Link',
@@ -109,19 +132,17 @@ class TestEndToEndIntegration:
                     'screenshotBase64': sample_screenshot
                 }
             ]
-            
-            step_ids = []
-            for step_data in steps_data:
-                response = client.post('/api/recording/chunk', 
-                                       json=step_data,
-                                       content_type='application/json')
-                assert response.status_code == 200
-                chunk_data = response.get_json()
-                assert 'stepId' in chunk_data
-                assert 'imageUrl' in chunk_data
-                assert chunk_data['imageUrl'].startswith('/static/images/')
-                assert chunk_data['status'] == 'saved'
-                step_ids.append(chunk_data['stepId'])
+
+            response = client.post('/api/recording/chunks',
+                                   json={'sessionId': session_id, 'steps': steps_data},
+                                   content_type='application/json')
+            assert response.status_code == 200
+            chunk_data = response.get_json()
+            assert chunk_data['status'] == 'saved'
+            assert len(chunk_data['stepIds']) == 3
+            for image_url in chunk_data['imageUrls']:
+                assert image_url.startswith('/static/images/')
+            step_ids = chunk_data['stepIds']
             
             # Step 3: Extension stops recording
             response = client.post('/api/recording/stop',
@@ -169,11 +190,13 @@ class TestEndToEndIntegration:
             assert len(details['steps']) == 3
             assert 'totalDurationFrames' in details
             
-            # Verify steps are in correct order
+            # Verify steps are in correct order. /stop joins the background
+            # audio patches, so by now every step has its generated audio
             for i, step in enumerate(details['steps']):
                 assert step['orderIndex'] == i + 1
                 assert step['imageUrl'].startswith('/static/images/')
-                assert step['audioUrl'] is not None or step['audioUrl'] == ''
+                assert step['audioUrl'] is not None
+                assert step['audioUrl'].startswith('/static/audio/')
                 assert step['posX'] == steps_data[i]['posX']
                 assert step['posY'] == steps_data[i]['posY']
                 assert step['targetText'] == steps_data[i]['targetText']
@@ -189,7 +212,7 @@ class TestEndToEndIntegration:
             assert len(db_steps) == 3
             for i, db_step in enumerate(db_steps):
                 assert db_step.order_index == i + 1
-                assert db_step.action_type.value == 'click'
+                assert db_step.action_type == ActionType.CLICK
                 assert db_step.image_url is not None
     
     def test_error_recovery_invalid_session(self, client, sample_screenshot):
@@ -229,44 +252,21 @@ class TestEndToEndIntegration:
         error_data = response.get_json()
         assert 'error' in error_data or 'message' in error_data
     
-    def test_soft_delete_consistency(self, app, client, sample_screenshot):
+    def test_soft_delete_consistency(self, app, client, recorded_project):
         """
         Test that soft delete maintains data consistency
-        
+
         Validates: Requirements 8.3, 18.4, 18.5 (soft delete preservation)
         """
+        project_id, _, _ = recorded_project
         with app.app_context():
-            # Create a project with steps
-            response = client.post('/api/recording/start')
-            session_id = response.get_json()['sessionId']
-            
-            # Add a step
-            client.post('/api/recording/chunk',
-                       json={
-                           'sessionId': session_id,
-                           'orderIndex': 1,
-                           'actionType': 'click',
-                           'targetText': 'Test',
-                           'posX': 100,
-                           'posY': 100,
-                           'viewportWidth': 1920,
-                           'viewportHeight': 1080,
-                           'screenshotBase64': sample_screenshot
-                       },
-                       content_type='application/json')
-            
-            # Stop recording
-            response = client.post('/api/recording/stop',
-                                  json={'sessionId': session_id},
-                                  content_type='application/json')
-            project_id = response.get_json()['projectId']
-            
             # Soft delete the project
             response = client.delete(f'/api/projects/{project_id}')
             assert response.status_code == 200
             
             # Verify project is marked as deleted but still in database
-            db_project = app.db_session.query(Project).get(project_id)
+            # (session.get is the 2.x API and hits the identity map on reuse)
+            db_project = app.db_session.get(Project, project_id)
             assert db_project is not None
             assert db_project.deleted_at is not None
             
@@ -279,46 +279,28 @@ class TestEndToEndIntegration:
             projects = response.get_json()['projects']
             assert not any(p['id'] == project_id for p in projects)
     
-    def test_folder_organization_consistency(self, app, client, sample_screenshot):
+    def test_folder_organization_consistency(self, app, client, recorded_project):
         """
         Test folder organization across dashboard operations
-        
+
         Validates: Requirements 7.1, 7.2, 7.5, 23.3 (folder management)
         """
+        # Project recorded with no explicit folder defaults to All Flows
+        project_id, _, _ = recorded_project
         with app.app_context():
+            # Fetch the system folder once up front; both assertions below
+            # reuse the same row instead of re-querying it
+            all_flows = app.db_session.query(Folder).filter_by(name='All Flows').first()
+
             # Create a custom folder
             response = client.post('/api/folders',
                                   json={'name': 'Product Demos'},
                                   content_type='application/json')
             assert response.status_code == 201
             custom_folder_id = response.get_json()['id']
-            
-            # Create a project (should default to All Flows)
-            response = client.post('/api/recording/start')
-            session_id = response.get_json()['sessionId']
-            
-            client.post('/api/recording/chunk',
-                       json={
-                           'sessionId': session_id,
-                           'orderIndex': 1,
-                           'actionType': 'click',
-                           'targetText': 'Test',
-                           'posX': 100,
-                           'posY': 100,
-                           'viewportWidth': 1920,
-                           'viewportHeight': 1080,
-                           'screenshotBase64': sample_screenshot
-                       },
-                       content_type='application/json')
-            
-            response = client.post('/api/recording/stop',
-                                  json={'sessionId': session_id},
-                                  content_type='application/json')
-            project_id = response.get_json()['projectId']
-            
+
             # Verify default folder assignment
-            db_project = app.db_session.query(Project).get(project_id)
-            all_flows = app.db_session.query(Folder).filter_by(name='All Flows').first()
+            db_project = app.db_session.get(Project, project_id)
             assert db_project.folder_id == all_flows.id
             
             # Move project to custom folder
@@ -332,42 +314,27 @@ class TestEndToEndIntegration:
             filtered_projects = response.get_json()['projects']
             assert len(filtered_projects) == 1
             assert filtered_projects[0]['id'] == project_id
+
+            # The move is also visible in the database via an indexed
+            # existence probe (no listing scan; stays O(log n) as data grows)
+            assert app.db_session.query(
+                exists().where(Project.id == project_id,
+                               Project.folder_id == custom_folder_id)
+            ).scalar()
             
             # Verify project STILL appears in All Flows (All Flows shows all non-trash projects)
             response = client.get(f'/api/projects?folderId={all_flows.id}')
             all_flows_projects = response.get_json()['projects']
             assert any(p['id'] == project_id for p in all_flows_projects)
     
-    def test_script_editing_updates_composition(self, app, client, sample_screenshot):
+    def test_script_editing_updates_composition(self, app, client, recorded_project):
         """
         Test that script editing triggers TTS and updates video composition
-        
+
         Validates: Requirements 11.1, 11.2, 11.5 (script editing and TTS)
         """
+        project_id, _, _ = recorded_project
         with app.app_context():
-            # Create a project with a step
-            response = client.post('/api/recording/start')
-            session_id = response.get_json()['sessionId']
-            
-            client.post('/api/recording/chunk',
-                       json={
-                           'sessionId': session_id,
-                           'orderIndex': 1,
-                           'actionType': 'click',
-                           'targetText': 'Login',
-                           'posX': 100,
-                           'posY': 100,
-                           'viewportWidth': 1920,
-                           'viewportHeight': 1080,
-                           'screenshotBase64': sample_screenshot
-                       },
-                       content_type='application/json')
-            
-            response = client.post('/api/recording/stop',
-                                  json={'sessionId': session_id},
-                                  content_type='application/json')
-            project_id = response.get_json()['projectId']
-            
             # Get step details
             response = client.get(f'/api/projects/{project_id}/details')
             step = response.get_json()['steps'][0]
@@ -146,6 +146,44 @@ class TestChunkUploadEdgeCases:
         assert data['error'] == 'Bad Request'
         assert 'Invalid Base64 image data' in data['message']
     
+    def test_chunk_upload_multipart(self, client, db_session):
+        """
+        Test uploading a chunk as multipart/form-data with a raw PNG part.
+
+        Validates: Requirements 15.2, 15.3
+        """
+        # Start recording session (default folder is seeded by the app fixture)
+        response = client.post('/api/recording/start')
+        assert response.status_code == 200
+        session_id = response.get_json()['sessionId']
+
+        # Upload chunk with the screenshot as a file part
+        img = Image.new('RGB', (100, 100), color='red')
+        buffer = BytesIO()
+        img.save(buffer, format='PNG')
+        buffer.seek(0)
+
+        response = client.post(
+            '/api/recording/chunk',
+            data={
+                'sessionId': session_id,
+                'orderIndex': '0',
+                'actionType': 'click',
+                'targetText': 'Submit Button',
+                'posX': '450',
+                'posY': '320',
+                'screenshot': (buffer, 'screenshot.png')
+            },
+            content_type='multipart/form-data'
+        )
+
+        # Verify response
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['status'] == 'saved'
+        assert 'stepId' in data
+        assert data['imageUrl'].startswith('/static/images/')
+
     def test_chunk_upload_with_missing_session_id(self, client, db_session):
         """
         Test that missing sessionId field is rejected.
@@ -305,3 +343,23 @@ class TestRecordingSessionBasics:
         data = response.get_json()
         assert 'error' in data
         assert 'Missing required field: sessionId' in data['message']
+
+
+class TestInMemorySessionStoreExpiry:
+    """Unit tests for in-memory session store TTL behavior."""
+
+    def test_expired_session_is_dropped(self, monkeypatch):
+        """Sessions past their TTL read back as gone, like the Redis backend."""
+        from services import session_store as store_module
+
+        now = [1000.0]
+        monkeypatch.setattr(store_module.time, 'monotonic', lambda: now[0])
+
+        store = store_module.InMemorySessionStore()
+        store.set('sid', {'status': 'completed'}, ttl=60)
+        assert store.get('sid') == {'status': 'completed'}
+
+        now[0] += 61
+        assert store.get('sid') is None
+        with pytest.raises(KeyError):
+            store.increment('sid', 'step_count')
@@ -140,8 +140,8 @@ class TestThumbnailGeneration:
         # Verify thumbnail URL format
         assert thumbnail_url.startswith('/static/thumbnails/'), \
             f"Thumbnail URL should start with /static/thumbnails/, got: {thumbnail_url}"
-        assert thumbnail_url.endswith('.png'), \
-            f"Thumbnail URL should end with .png, got: {thumbnail_url}"
+        assert thumbnail_url.endswith('.webp'), \
+            f"Thumbnail URL should end with .webp, got: {thumbnail_url}"
         
         # Verify thumbnail file exists
         thumbnail_filename = thumbnail_url.split('/')[-1]
@@ -151,8 +151,8 @@ class TestThumbnailGeneration:
         
         # Verify thumbnail dimensions
         thumbnail_image = Image.open(thumbnail_path)
-        assert thumbnail_image.format == 'PNG', \
-            f"Thumbnail should be PNG format, got: {thumbnail_image.format}"
+        assert thumbnail_image.format == 'WEBP', \
+            f"Thumbnail should be WebP format, got: {thumbnail_image.format}"
         
         # Thumbnail should fit within 320x180 while maintaining aspect ratio
         assert thumbnail_image.width <= 320, \
@@ -198,14 +198,19 @@ class TestStorageServiceEdgeCases:
         with pytest.raises(ValueError, match="Source image not found"):
             storage_service.generate_thumbnail("/static/images/nonexistent.png")
     
-    def test_unique_filenames(self, storage_service):
-        """Test that generated filenames are unique."""
+    def test_identical_images_deduplicated(self, storage_service):
+        """Test that identical uploads share one content-addressed file."""
         image_bytes = generate_test_image(100, 100)
         base64_image = image_to_base64(image_bytes)
-        
+
         # Save same image multiple times
         url1 = storage_service.save_image(base64_image)
         url2 = storage_service.save_image(base64_image)
-        
-        # URLs should be different
-        assert url1 != url2, "Generated filenames should be unique"
+
+        # Identical content maps to the same file
+        assert url1 == url2, "Identical images should deduplicate to one URL"
+
+        # Different content still gets its own file
+        other_bytes = generate_test_image(101, 101)
+        url3 = storage_service.save_image(image_to_base64(other_bytes))
+        assert url3 != url1, "Distinct images should get distinct URLs"
@@ -0,0 +1,28 @@
+"""
+Small query helpers shared across route modules.
+
+These keep hot paths on lightweight SQL (EXISTS-style probes, plain
+``count(*)``) instead of hydrating ORM rows that are immediately discarded.
+"""
+
+from sqlalchemy import literal
+
+
+def exists_id(session, model, row_id):
+    """
+    Check whether a row of ``model`` with the given primary key exists.
+
+    Emits ``SELECT true ... WHERE id = :id LIMIT 1`` — no columns fetched,
+    no ORM object constructed.
+
+    Args:
+        session: Active SQLAlchemy session
+        model: Mapped class with an ``id`` column
+        row_id: Primary key value to probe
+
+    Returns:
+        True if the row exists, False otherwise
+    """
+    return session.query(literal(True)).filter(
+        model.id == row_id
+    ).limit(1).scalar() is not None
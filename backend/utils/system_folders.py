@@ -0,0 +1,52 @@
+"""
+Helpers for resolving system folder IDs.
+
+System folders ("All Flows", "Trash") are immutable bootstrap rows, so
+their IDs are cached on the application after the first lookup instead
+of being re-queried on every request. The cache is dropped whenever a
+folder row is updated or deleted.
+"""
+
+from flask import current_app
+from sqlalchemy import event
+
+from models.folder import Folder, FolderType
+
+
+_CACHE_KEY = 'system_folder_ids'
+
+
+def get_system_folder_id(db_session, name):
+    """
+    Return the ID of the system folder with the given name.
+
+    Args:
+        db_session: Active SQLAlchemy session
+        name: System folder name ('All Flows' or 'Trash')
+
+    Returns:
+        Folder ID as int, or None if the folder does not exist
+    """
+    cache = current_app.extensions.setdefault(_CACHE_KEY, {})
+    folder_id = cache.get(name)
+
+    if folder_id is None:
+        folder_id = db_session.query(Folder.id).filter_by(
+            name=name,
+            type=FolderType.SYSTEM
+        ).scalar()
+        if folder_id is not None:
+            cache[name] = folder_id
+
+    return folder_id
+
+
+@event.listens_for(Folder, 'after_update')
+@event.listens_for(Folder, 'after_delete')
+def _invalidate_cache(mapper, connection, target):
+    """Drop the cached IDs whenever any folder row is mutated."""
+    try:
+        current_app.extensions.pop(_CACHE_KEY, None)
+    except RuntimeError:
+        # No application context (e.g. direct script usage); nothing cached
+        pass